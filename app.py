@@ -9,30 +9,36 @@ determining the optimal starting age for Provident Fund investment.
 import streamlit as st
 import pandas as pd
 
-from src.models import ProvidentInputs
-from src.calculator import (
-    run_full_comparison,
-    generate_yearly_growth,
-    generate_comparison_dataframe,
-    generate_yearly_dataframe,
-    generate_sensitivity_matrix,
-    calculate_tax_comparison,
-    calculate_comparison_for_starting_age,
-    calculate_monthly_withdrawal_comparison,
+from src.calculator import generate_comparison_dataframe
+from src.cache import (
+    comparison_export,
+    yearly_growth_export,
+)
+from src.export import (
+    COMPRESSIONS,
+    DOWNLOAD_MAX_SIZE,
+    available_formats,
+    export_filename,
+    export_mime,
+    sensitivity_export,
 )
 from src.presentation.inputs import render_sidebar_inputs, render_info_box
 from src.presentation.charts import (
     create_age_crossover_chart,
     create_difference_by_age_chart,
     create_growth_comparison_chart,
+    create_growth_by_starting_age_chart,
     create_tax_comparison_chart,
     create_tax_savings_chart,
     create_sensitivity_heatmap,
     create_withdrawal_mode_comparison,
     create_monthly_withdrawal_chart,
     create_monthly_withdrawal_breakdown_chart,
+    create_drawdown_chart,
 )
 from src.presentation.styles import CUSTOM_CSS, format_currency, format_percentage
+from src.graph import build_comparison_graph
+from src.profiling import Profiler, profiling_enabled_from_env
 
 # Page configuration
 st.set_page_config(
@@ -69,46 +75,36 @@ Compare the long-term financial outcomes of two investment strategies:
 inputs = render_sidebar_inputs()
 render_info_box()
 
-# Run comparison
-summary = run_full_comparison(inputs)
-yearly_growth = generate_yearly_growth(inputs)
-tax_data = calculate_tax_comparison(inputs)
-
-# Also run with lump sum for comparison
-lump_sum_inputs = ProvidentInputs(
-    current_age=inputs.current_age,
-    retirement_age=inputs.retirement_age,
-    life_expectancy=inputs.life_expectancy,
-    annual_contribution=inputs.annual_contribution,
-    annual_cap=inputs.annual_cap,
-    provident_expected_return=inputs.provident_expected_return,
-    personal_expected_return=inputs.personal_expected_return,
-    inflation_rate=inputs.inflation_rate,
-    provident_mgmt_fee=inputs.provident_mgmt_fee,
-    personal_mgmt_fee=inputs.personal_mgmt_fee,
-    capital_gains_tax=inputs.capital_gains_tax,
-    withdrawal_mode="lump_sum",
-)
-summary_lump = run_full_comparison(lump_sum_inputs)
-
-annuity_inputs = ProvidentInputs(
-    current_age=inputs.current_age,
-    retirement_age=inputs.retirement_age,
-    life_expectancy=inputs.life_expectancy,
-    annual_contribution=inputs.annual_contribution,
-    annual_cap=inputs.annual_cap,
-    provident_expected_return=inputs.provident_expected_return,
-    personal_expected_return=inputs.personal_expected_return,
-    inflation_rate=inputs.inflation_rate,
-    provident_mgmt_fee=inputs.provident_mgmt_fee,
-    personal_mgmt_fee=inputs.personal_mgmt_fee,
-    capital_gains_tax=inputs.capital_gains_tax,
-    withdrawal_mode="annuity",
+# Profiling mode: per-stage timings, shown in a diagnostics panel at the bottom.
+# Each full rerun starts a new profiler in session_state; fragment reruns skip
+# this line, so fragments look it up there and add their spans to it
+profiler = st.session_state["profiler"] = Profiler(
+    enabled=st.sidebar.checkbox(
+        "Profiling mode",
+        value=profiling_enabled_from_env(),
+        help="Record per-stage timings for this run (also enabled by PROVIDENT_PROFILE=1)",
+    )
 )
-summary_annuity = run_full_comparison(annuity_inputs)
+
+# Run comparison through the per-session computation graph: only stages
+# downstream of the inputs that changed since the last rerun are recomputed
+graph = st.session_state.setdefault("computation_graph", build_comparison_graph())
+recomputed_stages = graph.update(inputs)
+
+# Both withdrawal modes share one accumulation pass; pick the user's mode from it
+with profiler.stage("summaries", "calculator"):
+    summaries_by_mode = graph.get("summaries")
+summary = summaries_by_mode[inputs.withdrawal_mode]
+summary_lump = summaries_by_mode["lump_sum"]
+summary_annuity = summaries_by_mode["annuity"]
+with profiler.stage("yearly_growth", "calculator"):
+    yearly_growth = graph.get("yearly_growth")
+with profiler.stage("tax_comparison", "calculator"):
+    tax_data = graph.get("tax_comparison")
 
 # Calculate monthly withdrawal comparison
-monthly_withdrawal = calculate_monthly_withdrawal_comparison(inputs)
+with profiler.stage("withdrawal", "calculator"):
+    monthly_withdrawal = graph.get("withdrawal")
 
 # Summary Metrics Row
 st.header("Summary")
@@ -192,7 +188,8 @@ The crossover point indicates when Provident Fund becomes advantageous.
 """
 )
 
-age_crossover_chart = create_age_crossover_chart(summary)
+with profiler.stage("create_age_crossover_chart", "chart"):
+    age_crossover_chart = create_age_crossover_chart(summary)
 st.plotly_chart(age_crossover_chart, use_container_width=True)
 
 # Two columns: Difference chart and growth chart
@@ -200,14 +197,41 @@ col_left, col_right = st.columns([1, 1])
 
 with col_left:
     st.subheader("Advantage by Starting Age")
-    diff_chart = create_difference_by_age_chart(summary)
+    with profiler.stage("create_difference_by_age_chart", "chart"):
+        diff_chart = create_difference_by_age_chart(summary)
     st.plotly_chart(diff_chart, use_container_width=True)
 
 with col_right:
     st.subheader("Growth Over Time (Your Age)")
-    growth_chart = create_growth_comparison_chart(yearly_growth)
+    with profiler.stage("create_growth_comparison_chart", "chart"):
+        growth_chart = create_growth_comparison_chart(yearly_growth)
     st.plotly_chart(growth_chart, use_container_width=True)
 
+# Views below are computed only when opened; reruns triggered inside them
+# stay scoped to their fragment where Streamlit supports fragments
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", lambda func: func)
+
+
+# Growth trajectories for several starting ages from one matrix evaluation
+@fragment
+def render_growth_by_starting_age():
+    profiler = st.session_state["profiler"]
+    if not st.toggle("Compare Growth Across Starting Ages", value=False, key="growth_by_age_view"):
+        return
+    compared_ages = st.multiselect(
+        "Starting ages",
+        options=list(range(18, 60)),
+        default=sorted({max(18, inputs.current_age - 10), inputs.current_age, min(59, inputs.current_age + 10)}),
+    )
+    with profiler.stage("growth_matrix", "calculator"):
+        growth_matrix = graph.get("growth_matrix")
+    with profiler.stage("create_growth_by_starting_age_chart", "chart"):
+        growth_by_age_chart = create_growth_by_starting_age_chart(growth_matrix, compared_ages)
+    st.plotly_chart(growth_by_age_chart, use_container_width=True)
+
+
+render_growth_by_starting_age()
+
 st.divider()
 
 # Tax Analysis
@@ -225,11 +249,13 @@ st.markdown(
 col_tax1, col_tax2 = st.columns([1, 1])
 
 with col_tax1:
-    tax_chart = create_tax_comparison_chart(tax_data)
+    with profiler.stage("create_tax_comparison_chart", "chart"):
+        tax_chart = create_tax_comparison_chart(tax_data)
     st.plotly_chart(tax_chart, use_container_width=True)
 
 with col_tax2:
-    savings_chart = create_tax_savings_chart(tax_data)
+    with profiler.stage("create_tax_savings_chart", "chart"):
+        savings_chart = create_tax_savings_chart(tax_data)
     st.plotly_chart(savings_chart, use_container_width=True)
 
 # Tax details expander
@@ -269,7 +295,8 @@ Compare the impact of choosing **Annuity** (0% tax after 60) vs **Lump Sum** (25
 """
 )
 
-withdrawal_chart = create_withdrawal_mode_comparison(summary_lump, summary_annuity)
+with profiler.stage("create_withdrawal_mode_comparison", "chart"):
+    withdrawal_chart = create_withdrawal_mode_comparison(summary_lump, summary_annuity)
 st.plotly_chart(withdrawal_chart, use_container_width=True)
 
 st.divider()
@@ -284,9 +311,9 @@ Compare the **monthly income** (קצבה) you would receive from each account du
 **Assumptions:**
 - Retirement at age {inputs.retirement_age}, life expectancy age {inputs.life_expectancy}
 - Withdrawal period: **{monthly_withdrawal.withdrawal_years} years**
-- Conservative 3% return during withdrawal phase
+- Conservative {monthly_withdrawal.withdrawal_return:.0%} return during withdrawal phase
 - **Provident Fund:** 0% tax on monthly withdrawals (annuity after 60)
-- **Personal Account:** 25% tax on the gains portion of each withdrawal
+- **Personal Account:** 25% tax on the gain realized by each withdrawal (FIFO cost basis)
 """
 )
 
@@ -344,11 +371,13 @@ else:
 col_mw1, col_mw2 = st.columns([1, 1])
 
 with col_mw1:
-    monthly_chart = create_monthly_withdrawal_chart(monthly_withdrawal)
+    with profiler.stage("create_monthly_withdrawal_chart", "chart"):
+        monthly_chart = create_monthly_withdrawal_chart(monthly_withdrawal)
     st.plotly_chart(monthly_chart, use_container_width=True)
 
 with col_mw2:
-    breakdown_chart = create_monthly_withdrawal_breakdown_chart(monthly_withdrawal)
+    with profiler.stage("create_monthly_withdrawal_breakdown_chart", "chart"):
+        breakdown_chart = create_monthly_withdrawal_breakdown_chart(monthly_withdrawal)
     st.plotly_chart(breakdown_chart, use_container_width=True)
 
 # Detailed monthly withdrawal breakdown
@@ -368,87 +397,164 @@ with st.expander("View Monthly Withdrawal Details", expanded=False):
     
     with detail_col2:
         st.markdown("#### Personal Account (קצבה)")
-        gain_ratio = monthly_withdrawal.personal_gain_ratio * 100
+        drawdown = monthly_withdrawal.personal_drawdown
+        gross_monthly = monthly_withdrawal.personal_gross_monthly
+        gain_ratio = float(drawdown.mean_realized_gain_monthly) / gross_monthly * 100 if gross_monthly else 0.0
         st.markdown(f"""
         - **Balance at Retirement:** {format_currency(monthly_withdrawal.personal_balance)}
         - **Total Contributions:** {format_currency(monthly_withdrawal.personal_contributions)}
         - **Gains:** {format_currency(monthly_withdrawal.personal_balance - monthly_withdrawal.personal_contributions)}
-        - **Gains Portion:** {gain_ratio:.1f}% of each withdrawal
+        - **Gains Portion:** {gain_ratio:.1f}% of withdrawals on average
         - **Gross Monthly Withdrawal:** {format_currency(monthly_withdrawal.personal_gross_monthly)}
-        - **Tax per Month (25% on gains):** {format_currency(monthly_withdrawal.personal_tax_per_month)}
-        - **Net Monthly Withdrawal:** {format_currency(monthly_withdrawal.personal_net_monthly)}
+        - **Average Tax per Month (25% on realized gains):** {format_currency(monthly_withdrawal.personal_tax_per_month)}
+        - **Net Monthly Withdrawal:** {format_currency(monthly_withdrawal.personal_net_monthly)} on average
         """)
 
+    with profiler.stage("create_drawdown_chart", "chart"):
+        drawdown_chart = create_drawdown_chart(monthly_withdrawal, inputs.retirement_age)
+    st.plotly_chart(drawdown_chart, use_container_width=True)
+
 st.divider()
 
 # Sensitivity Analysis
 st.header("Sensitivity Analysis")
 
-tab1, tab2, tab3 = st.tabs(["Crossover Heatmap", "Comparison Table", "Data Export"])
+# Only the selected view is computed (the heatmap by default)
+SENSITIVITY_VIEWS = ["Crossover Heatmap", "Comparison Table", "Data Export"]
 
-with tab1:
-    st.markdown(
-        """
-    This heatmap shows the **crossover age** for different combinations of
-    **expected return** and **inflation rate**.
-    
-    - **Green (lower age):** Provident Fund becomes beneficial earlier
-    - **Red (higher age):** Need to start younger for Provident Fund to win
-    - **"Never":** Personal Account always wins
-    """
+
+@fragment
+def render_sensitivity_section():
+    profiler = st.session_state["profiler"]
+    view = st.radio(
+        "View",
+        SENSITIVITY_VIEWS,
+        index=0,
+        horizontal=True,
+        label_visibility="collapsed",
+        key="sensitivity_view",
     )
 
-    heatmap = create_sensitivity_heatmap(summary)
-    st.plotly_chart(heatmap, use_container_width=True)
+    if view == "Crossover Heatmap":
+        st.markdown(
+            """
+        This heatmap shows the **crossover age** for different combinations of
+        **expected return** and **inflation rate**.
+        
+        - **Green (lower age):** Provident Fund becomes beneficial earlier
+        - **Red (higher age):** Need to start younger for Provident Fund to win
+        - **"Never":** Personal Account always wins
+        """
+        )
 
-with tab2:
-    st.subheader("Comparison by Starting Age")
-    
-    df = generate_comparison_dataframe(summary)
-    
-    # Format currency columns
-    currency_cols = ["Provident Gross", "Provident Tax", "Provident Net",
-                     "Personal Gross", "Personal Tax", "Personal Net", "Difference"]
-    for col in currency_cols:
-        df[col] = df[col].apply(lambda x: f"₪{x:,.0f}")
-    
-    df["Difference %"] = df["Difference %"].apply(lambda x: f"{x:+.1f}%")
-    
-    # Highlight current age row
-    def highlight_current_age(row):
-        if row["Starting Age"] == inputs.current_age:
-            return ["background-color: #d97706; color: white; font-weight: bold"] * len(row)
-        return [""] * len(row)
-    
-    styled_df = df.style.apply(highlight_current_age, axis=1)
-    st.dataframe(styled_df, use_container_width=True, height=400)
+        with profiler.stage("create_sensitivity_heatmap", "chart"):
+            heatmap = create_sensitivity_heatmap(summary, grid=graph.get("sensitivity"))
+        st.plotly_chart(heatmap, use_container_width=True)
 
-with tab3:
-    st.subheader("Export Data")
-    
-    # Age comparison data
-    st.markdown("**Age Comparison Data**")
-    comparison_df = generate_comparison_dataframe(summary)
-    csv_comparison = comparison_df.to_csv(index=False)
-    st.download_button(
-        label="Download Age Comparison CSV",
-        data=csv_comparison,
-        file_name="provident_vs_personal_comparison.csv",
-        mime="text/csv",
-    )
-    
-    # Yearly growth data
-    if yearly_growth:
-        st.markdown("**Yearly Growth Data**")
-        yearly_df = generate_yearly_dataframe(yearly_growth)
-        csv_yearly = yearly_df.to_csv(index=False)
-        st.download_button(
-            label="Download Yearly Growth CSV",
-            data=csv_yearly,
-            file_name="yearly_growth.csv",
-            mime="text/csv",
+    elif view == "Comparison Table":
+        st.subheader("Comparison by Starting Age")
+
+        with profiler.stage("generate_comparison_dataframe", "dataframe"):
+            df = generate_comparison_dataframe(summary)
+
+            # Format currency columns
+            currency_cols = ["Provident Gross", "Provident Tax", "Provident Net",
+                             "Personal Gross", "Personal Tax", "Personal Net", "Difference"]
+            for col in currency_cols:
+                df[col] = df[col].apply(lambda x: f"₪{x:,.0f}")
+
+            df["Difference %"] = df["Difference %"].apply(lambda x: f"{x:+.1f}%")
+
+        # Highlight current age row
+        def highlight_current_age(row):
+            if row["Starting Age"] == inputs.current_age:
+                return ["background-color: #d97706; color: white; font-weight: bold"] * len(row)
+            return [""] * len(row)
+
+        styled_df = df.style.apply(highlight_current_age, axis=1)
+        st.dataframe(styled_df, use_container_width=True, height=400)
+
+    else:
+        st.subheader("Export Data")
+
+        # Payloads are built only when requested and cached by inputs + format
+        format_labels = {"csv": "CSV", "parquet": "Parquet", "excel": "Excel"}
+        fmt_col, compression_col = st.columns(2)
+        with fmt_col:
+            export_format = st.selectbox(
+                "Format", available_formats(), format_func=format_labels.get, key="export_format"
+            )
+        with compression_col:
+            compression = st.selectbox(
+                "Compression",
+                COMPRESSIONS[export_format],
+                format_func=lambda codec: codec or "none",
+                key="export_compression",
+            )
+        export_key = (inputs, export_format, compression)
+
+        def render_export(label, stem, build):
+            state_key = f"export_{stem}"
+            if st.button(f"Prepare {label}", key=f"{state_key}_prepare"):
+                with profiler.stage(f"{stem}_export", "export"):
+                    st.session_state[state_key] = (export_key, build())
+            prepared = st.session_state.get(state_key)
+            if prepared is not None and prepared[0] == export_key:
+                st.download_button(
+                    label=f"Download {label}",
+                    data=prepared[1],
+                    file_name=export_filename(stem, export_format, compression),
+                    mime=export_mime(export_format, compression),
+                    key=f"{state_key}_download",
+                )
+
+        # Age comparison data
+        st.markdown("**Age Comparison Data**")
+        render_export(
+            "Age Comparison",
+            "provident_vs_personal_comparison",
+            lambda: comparison_export(inputs, export_format, compression),
         )
 
+        # Yearly growth data
+        if yearly_growth:
+            st.markdown("**Yearly Growth Data**")
+            render_export(
+                "Yearly Growth",
+                "yearly_growth",
+                lambda: yearly_growth_export(inputs, export_format, compression),
+            )
+
+        # Every sensitivity scenario, serialized frame by frame into a spooled
+        # file. Streamlit copies download data into its media store when the
+        # button renders (and does not accept spooled files), so the payload is
+        # read once for the button, capped, and never kept in session_state;
+        # the button lasts until the next rerun.
+        st.markdown("**Sensitivity Scenarios** (every return x inflation x starting age)")
+        stem = "sensitivity_scenarios"
+        if st.button("Prepare Sensitivity Scenarios", key=f"export_{stem}_prepare"):
+            with profiler.stage(f"{stem}_export", "export"):
+                spool = sensitivity_export(inputs, export_format, compression)
+            with spool:
+                size = spool.seek(0, 2)
+                spool.seek(0)
+                if size > DOWNLOAD_MAX_SIZE:
+                    st.error(
+                        f"The export is {size / 1024**2:,.0f} MB, above the "
+                        f"{DOWNLOAD_MAX_SIZE / 1024**2:,.0f} MB download limit; "
+                        "use a compressed format or the batch CLI."
+                    )
+                else:
+                    st.download_button(
+                        label="Download Sensitivity Scenarios",
+                        data=spool.read(),
+                        file_name=export_filename(stem, export_format, compression),
+                        mime=export_mime(export_format, compression),
+                        key=f"export_{stem}_download",
+                    )
+
+render_sensitivity_section()
+
 st.divider()
 
 # Key Assumptions
@@ -495,6 +601,44 @@ with st.expander("Click to view the assumptions used in this analysis", expanded
     """
     )
 
+# Performance diagnostics (profiling mode only). The panel is a fragment of
+# its own, so Refresh picks up spans recorded by fragment reruns since
+@fragment
+def render_diagnostics():
+    profiler = st.session_state["profiler"]
+    with st.expander("Performance Diagnostics", expanded=False):
+        st.button("Refresh", key="refresh_diagnostics", help="Include stages rerun by fragments since")
+        st.markdown(f"**Elapsed since the last full rerun:** {profiler.total_ms:,.1f} ms")
+        st.caption(
+            "Invalidated stages in the last full rerun: "
+            + (", ".join(sorted(recomputed_stages)) or "none")
+        )
+        st.dataframe(
+            pd.DataFrame(profiler.summary()).round(2),
+            use_container_width=True,
+            hide_index=True,
+        )
+        diag_col1, diag_col2 = st.columns(2)
+        with diag_col1:
+            st.download_button(
+                label="Download Timings JSON",
+                data=profiler.to_json(),
+                file_name="provident_profile.json",
+                mime="application/json",
+            )
+        with diag_col2:
+            st.download_button(
+                label="Download Chrome Trace",
+                data=profiler.to_chrome_trace(),
+                file_name="provident_trace.json",
+                mime="application/json",
+                help="Open in chrome://tracing or ui.perfetto.dev",
+            )
+
+
+if profiler.enabled:
+    render_diagnostics()
+
 # Footer
 st.sidebar.divider()
 st.sidebar.markdown(
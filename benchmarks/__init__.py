@@ -0,0 +1 @@
+"""Benchmark harness for the calculator entry points."""
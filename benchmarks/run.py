@@ -0,0 +1,225 @@
+"""
+Reproducible benchmarks for every calculator entry point.
+
+Each benchmark runs one entry point over a deterministic grid of client
+profiles. The small, medium and large tiers scale the number of profiles
+and the density of the sensitivity grid. Timings are the best of several
+repeats, reported per call.
+
+Usage (from the repository root):
+    python -m benchmarks.run                           # all tiers, print results
+    python -m benchmarks.run --tier small              # one tier
+    python -m benchmarks.run --save benchmarks/baseline.json
+    python -m benchmarks.run --compare benchmarks/baseline.json --threshold 0.25
+
+With --compare, the exit status is 1 if any benchmark is slower than the
+baseline by more than the threshold, so it can gate CI.
+"""
+
+import argparse
+import itertools
+import json
+import platform
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+
+from src.models import ProvidentInputs
+from src.calculator import (
+    run_full_comparison,
+    generate_yearly_growth,
+    generate_sensitivity_matrix,
+    calculate_tax_comparison,
+    calculate_monthly_withdrawal_comparison,
+)
+
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+DEFAULT_THRESHOLD = 0.25  # Allowed slowdown before a benchmark counts as a regression
+
+
+@dataclass(frozen=True)
+class Tier:
+    """Scenario size for one benchmark tier."""
+
+    name: str
+    n_profiles: int  # Client profiles per benchmark
+    grid_size: int  # Return and inflation points in the sensitivity grid
+    repeat: int  # Repeats; the best one is reported
+
+
+TIERS = {
+    "small": Tier("small", n_profiles=10, grid_size=7, repeat=7),
+    "medium": Tier("medium", n_profiles=100, grid_size=25, repeat=5),
+    "large": Tier("large", n_profiles=1_000, grid_size=100, repeat=3),
+}
+
+
+def build_profiles(n_profiles: int) -> list[ProvidentInputs]:
+    """
+    Build a deterministic, realistic grid of client profiles.
+
+    Cycles through the slider domain: ages, contributions around the cap,
+    returns in 0.5% steps, fees in 0.05% steps and both withdrawal modes.
+    """
+    grid = itertools.product(
+        [25, 30, 35, 40, 45, 50, 55],  # current_age
+        [60, 65, 67],  # retirement_age
+        [50_000.0, 83_641.0, 120_000.0],  # annual_contribution
+        [0.06, 0.07, 0.08],  # provident_expected_return
+        [0.065, 0.08, 0.095],  # personal_expected_return
+        [0.004, 0.006, 0.008],  # provident_mgmt_fee
+        [0.015, 0.025, 0.035],  # inflation_rate
+        ["annuity", "lump_sum"],  # withdrawal_mode
+    )
+    profiles = []
+    for values in itertools.islice(itertools.cycle(grid), n_profiles):
+        age, retirement, contribution, provident, personal, fee, inflation, mode = values
+        profiles.append(ProvidentInputs(
+            current_age=age,
+            retirement_age=retirement,
+            life_expectancy=85,
+            annual_contribution=contribution,
+            annual_cap=83_641.0,
+            provident_expected_return=provident,
+            personal_expected_return=personal,
+            inflation_rate=inflation,
+            provident_mgmt_fee=fee,
+            personal_mgmt_fee=0.001,
+            capital_gains_tax=0.25,
+            withdrawal_mode=mode,
+        ))
+    return profiles
+
+
+def build_benchmarks(tier: Tier) -> dict[str, Callable[[], object]]:
+    """Build the benchmark callables for one tier."""
+    profiles = build_profiles(tier.n_profiles)
+    return_rates = np.linspace(0.03, 0.12, tier.grid_size).tolist()
+    inflation_rates = np.linspace(0.0, 0.05, tier.grid_size).tolist()
+    # The sensitivity matrix is per profile; use a slice so tiers stay comparable
+    sensitivity_profiles = profiles[: max(1, tier.n_profiles // 10)]
+
+    return {
+        "run_full_comparison": lambda: [run_full_comparison(p) for p in profiles],
+        "generate_yearly_growth": lambda: [generate_yearly_growth(p) for p in profiles],
+        "generate_sensitivity_matrix": lambda: [
+            generate_sensitivity_matrix(p, return_rates, inflation_rates)
+            for p in sensitivity_profiles
+        ],
+        "calculate_tax_comparison": lambda: [calculate_tax_comparison(p) for p in profiles],
+        "calculate_monthly_withdrawal_comparison": lambda: [
+            calculate_monthly_withdrawal_comparison(p) for p in profiles
+        ],
+    }
+
+
+def time_call(func: Callable[[], object], repeat: int) -> float:
+    """Best wall time of func over several repeats, in seconds."""
+    func()  # Warm up
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run_benchmarks(tier_names: list[str]) -> dict[str, float]:
+    """
+    Run the benchmarks for the given tiers.
+
+    Returns:
+        Dictionary mapping "tier/benchmark" to the best time in seconds
+    """
+    results = {}
+    for tier_name in tier_names:
+        tier = TIERS[tier_name]
+        for name, func in build_benchmarks(tier).items():
+            key = f"{tier.name}/{name}"
+            results[key] = time_call(func, tier.repeat)
+            print(f"{key:<55} {results[key] * 1000:>10.2f} ms", file=sys.stderr)
+    return results
+
+
+def environment() -> dict[str, str]:
+    """Describe the machine so baselines from different hosts are not confused."""
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+    }
+
+
+def save_baseline(results: dict[str, float], path: Path) -> None:
+    """Write results and environment to a baseline JSON file."""
+    payload = {"environment": environment(), "results": results}
+    path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n")
+
+
+def compare_to_baseline(
+    results: dict[str, float],
+    baseline_path: Path,
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[str]:
+    """
+    Print a regression report against a baseline.
+
+    Args:
+        results: Current results from run_benchmarks
+        baseline_path: Baseline JSON written by save_baseline
+        threshold: Allowed relative slowdown (0.25 = 25%)
+
+    Returns:
+        Names of the benchmarks that regressed
+    """
+    baseline = json.loads(baseline_path.read_text())["results"]
+    regressions = []
+
+    print(f"{'benchmark':<55} {'baseline':>10} {'current':>10} {'change':>8}")
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            print(f"{key:<55} {'-':>10} {current * 1000:>8.2f}ms {'new':>8}")
+            continue
+        change = current / previous - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(key)
+            flag = "  REGRESSION"
+        print(f"{key:<55} {previous * 1000:>8.2f}ms {current * 1000:>8.2f}ms {change:>+7.1%}{flag}")
+
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark the calculator entry points.")
+    parser.add_argument("--tier", choices=[*TIERS, "all"], default="all",
+                        help="Scenario tier to run (default: %(default)s)")
+    parser.add_argument("--save", type=Path, help="Write results to a baseline JSON file")
+    parser.add_argument("--compare", type=Path, help="Compare against a baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed relative slowdown (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    tier_names = list(TIERS) if args.tier == "all" else [args.tier]
+    results = run_benchmarks(tier_names)
+
+    if args.save:
+        save_baseline(results, args.save)
+    if args.compare:
+        regressions = compare_to_baseline(results, args.compare, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) regressed", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
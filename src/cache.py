@@ -0,0 +1,92 @@
+"""Memoization layer for the calculator entry points.
+
+Each wrapped function keeps a bounded LRU cache keyed on its arguments.
+ProvidentInputs is frozen (hashable), so unchanged parameters are never
+recomputed. The caches live at module level, so inside Streamlit they are
+shared across reruns and across concurrent user sessions, and they work
+the same way outside Streamlit.
+
+Cached results are shared between callers and must be treated as read-only.
+"""
+
+from dataclasses import replace
+from functools import lru_cache, wraps
+from typing import Callable
+
+from . import calculator, export, optimizer
+
+
+DEFAULT_CACHE_SIZE = 128  # Entries kept per entry point before LRU eviction
+EXPORT_CACHE_SIZE = 16  # Serialized export payloads are larger; keep fewer
+
+_cached_functions: list[Callable] = []
+
+
+def _freeze(value):
+    """Convert list arguments (e.g., rate grids) to hashable tuples."""
+    if isinstance(value, list):
+        return tuple(value)
+    return value
+
+
+def memoize(maxsize: int = DEFAULT_CACHE_SIZE) -> Callable[[Callable], Callable]:
+    """
+    Wrap a function in a thread-safe, bounded LRU cache.
+
+    List arguments are converted to tuples so they can be part of the key.
+
+    Args:
+        maxsize: Maximum number of cached results before LRU eviction
+
+    Returns:
+        Decorator producing the cached function, which also exposes
+        ``cache_info()`` and ``cache_clear()``
+    """
+    def decorator(func: Callable) -> Callable:
+        cached = lru_cache(maxsize=maxsize)(func)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            args = tuple(_freeze(arg) for arg in args)
+            kwargs = {key: _freeze(value) for key, value in kwargs.items()}
+            return cached(*args, **kwargs)
+
+        wrapper.cache_info = cached.cache_info
+        wrapper.cache_clear = cached.cache_clear
+        _cached_functions.append(wrapper)
+        return wrapper
+
+    return decorator
+
+
+def clear_caches() -> None:
+    """Clear every calculator cache."""
+    for func in _cached_functions:
+        func.cache_clear()
+
+
+run_full_comparison = memoize()(calculator.run_full_comparison)
+_run_multi_mode_comparison = memoize()(calculator.run_multi_mode_comparison)
+generate_yearly_growth = memoize()(calculator.generate_yearly_growth)
+calculate_tax_comparison = memoize()(calculator.calculate_tax_comparison)
+calculate_monthly_withdrawal_comparison = memoize()(
+    calculator.calculate_monthly_withdrawal_comparison
+)
+solve_crossover = memoize()(calculator.solve_crossover)
+evaluate_sensitivity_grid = memoize()(calculator.evaluate_sensitivity_grid)
+generate_sensitivity_analysis = memoize()(calculator.generate_sensitivity_analysis)
+generate_sensitivity_matrix = memoize()(calculator.generate_sensitivity_matrix)
+
+comparison_export = memoize(EXPORT_CACHE_SIZE)(export.comparison_export)
+yearly_growth_export = memoize(EXPORT_CACHE_SIZE)(export.yearly_growth_export)
+optimize_contribution_schedule = memoize()(optimizer.optimize_contribution_schedule)
+
+
+@wraps(calculator.run_multi_mode_comparison)
+def run_multi_mode_comparison(inputs, *args, **kwargs):
+    # Every mode is evaluated regardless, so the input's own mode must not split the key
+    return _run_multi_mode_comparison(replace(inputs, withdrawal_mode="lump_sum"), *args, **kwargs)
+
+
+run_multi_mode_comparison.cache_info = _run_multi_mode_comparison.cache_info
+run_multi_mode_comparison.cache_clear = _run_multi_mode_comparison.cache_clear
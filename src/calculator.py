@@ -1,6 +1,9 @@
 """Core calculation logic for Provident Fund vs Personal Investment comparison."""
 
-from typing import Optional
+from concurrent.futures import Executor
+from dataclasses import replace
+from functools import partial
+from typing import Optional, Union
 import pandas as pd
 import numpy as np
 
@@ -9,10 +12,16 @@ from .models import (
     YearlyResult,
     TaxCalculation,
     AgeComparisonResult,
+    AgeResultsTable,
     ComparisonSummary,
     SensitivityPoint,
     MonthlyWithdrawalResult,
+    CrossoverSolution,
+    SensitivityGrid,
+    YearlyGrowthTable,
 )
+from .executors import map_chunks
+from .decumulation import DEFAULT_WITHDRAWAL_RETURN, annual_deposit_lots, simulate_decumulation
 
 
 def calculate_future_value(
@@ -45,6 +54,36 @@ def calculate_future_value(
     return fv
 
 
+def annuity_factor(
+    annual_return,
+    years,
+) -> np.ndarray:
+    """
+    Vectorized future value factor of an annual annuity.
+
+    Array counterpart of ``calculate_future_value`` for a contribution of 1:
+    ((1 + r)^n - 1) / r, with n when r is zero and 0 for n <= 0.
+    Rates and years broadcast against each other.
+
+    Args:
+        annual_return: Annual return rate(s) (e.g., 0.07 for 7%)
+        years: Year count(s)
+
+    Returns:
+        Array of future value factors with the broadcast shape
+    """
+    years = np.maximum(np.asarray(years, dtype=float), 0.0)
+    growth = 1 + np.asarray(annual_return, dtype=float)
+
+    if growth.ndim == 0 and growth == 1:
+        return years
+
+    # Dividing by (growth - 1) rather than r keeps the one-year factor exactly 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        factor = (growth ** years - 1) / (growth - 1)
+    return np.where(growth == 1, years, factor)
+
+
 def calculate_inflation_adjusted_contributions(
     annual_contribution: float,
     inflation_rate: float,
@@ -54,7 +93,9 @@ def calculate_inflation_adjusted_contributions(
     Calculate the inflation-adjusted value of contributions at withdrawal time.
 
     Each contribution is adjusted for inflation from the time it was made
-    to the withdrawal date.
+    to the withdrawal date. The year-k contribution grows by inflation for
+    (years - k) years, so the sum is a geometric series:
+    Basis = PMT * [((1 + i)^n - 1) / i]
 
     Args:
         annual_contribution: Annual contribution amount
@@ -67,17 +108,33 @@ def calculate_inflation_adjusted_contributions(
     if years <= 0:
         return 0.0
     
-    # Each year's contribution is adjusted for remaining years of inflation
-    # Year 1 contribution grows by inflation for (years-1) years
-    # Year 2 contribution grows by inflation for (years-2) years
-    # etc.
-    total = 0.0
-    for year in range(1, years + 1):
-        years_to_grow = years - year
-        adjusted = annual_contribution * ((1 + inflation_rate) ** years_to_grow)
-        total += adjusted
+    growth = 1 + inflation_rate
+    if growth == 1:
+        return annual_contribution * years
     
-    return total
+    # Divide by (growth - 1) so a single contribution is returned unchanged
+    return annual_contribution * ((growth ** years - 1) / (growth - 1))
+
+
+def calculate_inflation_adjusted_contributions_array(
+    annual_contribution: float,
+    inflation_rate: float,
+    years,
+) -> np.ndarray:
+    """
+    Calculate inflation-adjusted contributions for many horizons at once.
+
+    Array counterpart of ``calculate_inflation_adjusted_contributions``.
+
+    Args:
+        annual_contribution: Annual contribution amount
+        inflation_rate: Annual inflation rate (e.g., 0.025 for 2.5%)
+        years: Array (or scalar) of year counts
+
+    Returns:
+        Array of inflation-adjusted contributions, same shape as years
+    """
+    return annual_contribution * annuity_factor(inflation_rate, years)
 
 
 def calculate_provident_tax(
@@ -129,6 +186,78 @@ def calculate_provident_tax(
     )
 
 
+def split_provident_tax(real_gains_tax, lump_sum_fraction, annuity_exempt: bool):
+    """
+    Split the full real-gains tax between the lump-sum and annuity shares.
+
+    Gains are spread pro rata over the balance, so each share owes its
+    fraction of the full tax, except that an exempt annuity share owes none.
+    Broadcasts over array arguments.
+
+    Args:
+        real_gains_tax: Tax on the whole balance withdrawn as a lump sum
+        lump_sum_fraction: Share of the balance taken as a lump sum (0-1)
+        annuity_exempt: True if annuity gains are tax-free
+
+    Returns:
+        Tuple of (lump-sum share tax, annuity share tax)
+    """
+    lump_sum_tax = lump_sum_fraction * real_gains_tax
+    annuity_tax = (1 - lump_sum_fraction) * (0.0 if annuity_exempt else real_gains_tax)
+    return lump_sum_tax, annuity_tax
+
+
+def calculate_split_provident_tax(
+    gross_balance: float,
+    total_contributions: float,
+    inflation_adjusted_contributions: float,
+    capital_gains_tax: float,
+    lump_sum_fraction: float,
+    age_at_withdrawal: int,
+) -> TaxCalculation:
+    """
+    Calculate tax for a Provident withdrawal split between lump sum and annuity.
+
+    Gains are spread pro rata over the balance, so the lump-sum share pays
+    real-gains tax on its share of the gain and the annuity share follows
+    the annuity rule (tax-free from age 60).
+
+    Args:
+        gross_balance: Total balance at withdrawal
+        total_contributions: Sum of nominal contributions
+        inflation_adjusted_contributions: Inflation-adjusted contributions
+        capital_gains_tax: Tax rate (e.g., 0.25)
+        lump_sum_fraction: Share of the balance taken as a lump sum (0-1)
+        age_at_withdrawal: Age when withdrawing
+
+    Returns:
+        TaxCalculation with all details
+    """
+    if not 0 <= lump_sum_fraction <= 1:
+        raise ValueError("lump_sum_fraction must be between 0 and 1")
+
+    lump_sum = calculate_provident_tax(
+        gross_balance, total_contributions, inflation_adjusted_contributions,
+        capital_gains_tax, "lump_sum", age_at_withdrawal,
+    )
+    lump_sum_tax, annuity_tax = split_provident_tax(
+        lump_sum.tax_amount,
+        lump_sum_fraction,
+        annuity_exempt=is_annuity_exempt("annuity", age_at_withdrawal),
+    )
+    tax_amount = float(lump_sum_tax + annuity_tax)
+
+    return TaxCalculation(
+        gross_balance=gross_balance,
+        total_contributions=total_contributions,
+        inflation_adjusted_contributions=inflation_adjusted_contributions,
+        nominal_gain=lump_sum.nominal_gain,
+        real_gain=lump_sum.real_gain,
+        tax_amount=tax_amount,
+        net_balance=gross_balance - tax_amount,
+    )
+
+
 def calculate_personal_tax(
     gross_balance: float,
     total_contributions: float,
@@ -254,6 +383,210 @@ def calculate_comparison_for_starting_age(
     )
 
 
+def is_annuity_exempt(withdrawal_mode: str, retirement_age: int) -> bool:
+    """Whether Provident gains are tax-free (annuity withdrawn at 60 or later)."""
+    return withdrawal_mode == "annuity" and retirement_age >= 60
+
+
+def accumulate(
+    contribution: float,
+    provident_net_return,
+    personal_net_return,
+    inflation_rate,
+    investment_years,
+) -> dict[str, np.ndarray]:
+    """
+    Run the accumulation phase with full broadcasting.
+
+    Everything here is independent of the withdrawal mode, so one
+    accumulation can be taxed under several withdrawal policies. Rates and
+    horizons can be arrays of any broadcast-compatible shape, so a
+    (return x inflation x horizon) tensor is evaluated in one shot.
+
+    Args:
+        contribution: Annual contribution to each account
+        provident_net_return: Provident net return(s) after fees
+        personal_net_return: Personal net return(s) after fees
+        inflation_rate: Inflation rate(s) for the real-gains basis
+        investment_years: Investment horizon(s) in years, may be fractional
+
+    Returns:
+        Dictionary with gross balances, contributions and inflation basis
+    """
+    investment_years = np.maximum(np.asarray(investment_years, dtype=float), 0.0)
+
+    return {
+        "provident_gross": contribution * annuity_factor(provident_net_return, investment_years),
+        "personal_gross": contribution * annuity_factor(personal_net_return, investment_years),
+        "contributions": contribution * investment_years,
+        "provident_inflation_adjusted": calculate_inflation_adjusted_contributions_array(
+            contribution, inflation_rate, investment_years
+        ),
+    }
+
+
+def apply_taxes(
+    accumulation: dict[str, np.ndarray],
+    capital_gains_tax: float,
+    annuity_exempt: bool,
+) -> dict[str, np.ndarray]:
+    """
+    Apply a withdrawal-mode tax policy to an accumulation result.
+
+    Args:
+        accumulation: Result of ``accumulate``
+        capital_gains_tax: Tax rate (e.g., 0.25)
+        annuity_exempt: True if Provident gains are tax-free
+
+    Returns:
+        Dictionary of arrays keyed by AgeComparisonResult field name
+    """
+    provident_gross = accumulation["provident_gross"]
+    personal_gross = accumulation["personal_gross"]
+    contributions = accumulation["contributions"]
+
+    # Provident: 0% on annuity after 60, otherwise tax on real gains
+    if annuity_exempt:
+        provident_tax = np.zeros_like(provident_gross)
+    else:
+        real_gain = np.maximum(
+            provident_gross - accumulation["provident_inflation_adjusted"], 0.0
+        )
+        provident_tax = capital_gains_tax * real_gain
+
+    # Personal: tax on nominal gains
+    personal_tax = capital_gains_tax * np.maximum(personal_gross - contributions, 0.0)
+
+    return {
+        "provident_gross": provident_gross,
+        "provident_contributions": contributions,
+        "provident_tax": provident_tax,
+        "provident_net": provident_gross - provident_tax,
+        "personal_gross": personal_gross,
+        "personal_contributions": contributions,
+        "personal_tax": personal_tax,
+        "personal_net": personal_gross - personal_tax,
+    }
+
+
+def accumulate_inputs(
+    inputs: ProvidentInputs,
+    investment_years,
+) -> dict[str, np.ndarray]:
+    """Run ``accumulate`` with the rates from a set of inputs."""
+    # Same contribution for both accounts (apples-to-apples comparison)
+    return accumulate(
+        contribution=inputs.annual_contribution,
+        provident_net_return=inputs.get_provident_net_return(),
+        personal_net_return=inputs.get_personal_net_return(),
+        inflation_rate=inputs.inflation_rate,
+        investment_years=investment_years,
+    )
+
+
+def evaluate_horizons(
+    inputs: ProvidentInputs,
+    investment_years: np.ndarray,
+) -> dict[str, np.ndarray]:
+    """
+    Evaluate gross, contributions, taxes and net for an array of horizons.
+
+    Horizons may be fractional, which gives a continuous net-value curve
+    for root finding.
+
+    Args:
+        inputs: All input parameters
+        investment_years: Array of investment horizons in years
+
+    Returns:
+        Dictionary of arrays keyed by AgeComparisonResult field name
+    """
+    return apply_taxes(
+        accumulate_inputs(inputs, investment_years),
+        capital_gains_tax=inputs.capital_gains_tax,
+        annuity_exempt=is_annuity_exempt(inputs.withdrawal_mode, inputs.retirement_age),
+    )
+
+
+def calculate_comparison_arrays(
+    inputs: ProvidentInputs,
+    min_age: int = 18,
+    max_age: int = 59,
+) -> dict[str, np.ndarray]:
+    """
+    Calculate the comparison for every starting age in a single vectorized pass.
+
+    Produces the same numbers as calling ``calculate_comparison_for_starting_age``
+    for each age, but as NumPy arrays indexed by starting age, without building
+    any per-age objects.
+
+    Args:
+        inputs: All input parameters
+        min_age: Minimum starting age to analyze
+        max_age: Maximum starting age to analyze
+
+    Returns:
+        Dictionary of arrays keyed by AgeComparisonResult field name
+    """
+    starting_ages = np.arange(min_age, max_age + 1)
+    investment_years = np.maximum(inputs.retirement_age - starting_ages, 0)
+
+    return {
+        "starting_age": starting_ages,
+        "investment_years": investment_years,
+        **evaluate_horizons(inputs, investment_years),
+    }
+
+
+def calculate_net_difference(
+    inputs: ProvidentInputs,
+    investment_years,
+) -> np.ndarray:
+    """
+    Calculate provident net minus personal net for (possibly fractional) horizons.
+
+    Args:
+        inputs: All input parameters
+        investment_years: Array (or scalar) of investment horizons in years
+
+    Returns:
+        Array of net differences. Positive = Provident wins.
+    """
+    values = evaluate_horizons(inputs, investment_years)
+    return values["provident_net"] - values["personal_net"]
+
+
+def find_crossover_ages(
+    starting_ages,
+    differences,
+) -> tuple[Optional[int], list[int]]:
+    """
+    Locate crossovers from already-computed differences by starting age.
+
+    Performs a vectorized sign-change search over the difference array
+    (provident net - personal net), so no ages are recomputed.
+
+    Args:
+        starting_ages: Starting ages, in ascending order
+        differences: Net difference for each starting age
+
+    Returns:
+        Tuple of (first age where Provident wins or None, every age at which
+        the winner flips relative to the previous decided age). Exact ties
+        (e.g., a one-year horizon) are skipped, so they never count as flips.
+    """
+    starting_ages = np.asarray(starting_ages)
+    signs = np.sign(np.asarray(differences))
+
+    win_indices = np.flatnonzero(signs > 0)
+    first_win = int(starting_ages[win_indices[0]]) if win_indices.size else None
+
+    decided = np.flatnonzero(signs != 0)
+    decided_signs = signs[decided]
+    flips = decided[1:][decided_signs[1:] != decided_signs[:-1]]
+    return first_win, starting_ages[flips].tolist()
+
+
 def find_crossover_age(
     inputs: ProvidentInputs,
     min_age: int = 18,
@@ -262,8 +595,8 @@ def find_crossover_age(
     """
     Find the starting age where Provident Fund becomes better than personal.
 
-    Searches from max_age down to min_age to find the oldest age where
-    Provident Fund first becomes advantageous.
+    Scans from min_age up to max_age and returns the first age where
+    Provident Fund is advantageous.
 
     Args:
         inputs: All input parameters
@@ -273,44 +606,182 @@ def find_crossover_age(
     Returns:
         The crossover age, or None if Provident is never better
     """
-    # Start from oldest age and work backwards
-    # We want to find the LATEST age where provident is still better
-    # because that tells us "from what age onwards should you use provident"
-    
-    crossover_age = None
-    
-    for age in range(min_age, max_age + 1):
-        result = calculate_comparison_for_starting_age(age, inputs)
-        if result.provident_wins:
-            crossover_age = age
-            break  # Found the first age where provident wins
-    
+    arrays = calculate_comparison_arrays(inputs, min_age, max_age)
+    crossover_age, _ = find_crossover_ages(
+        arrays["starting_age"], arrays["provident_net"] - arrays["personal_net"]
+    )
     return crossover_age
 
 
-def run_full_comparison(
+def _brentq(
+    f,
+    a: float,
+    b: float,
+    xtol: float = 1e-9,
+    maxiter: int = 100,
+) -> float:
+    """
+    Find a root of f in [a, b] with Brent's method.
+
+    Combines bisection, secant and inverse quadratic interpolation, so it
+    never does worse than bisection and usually converges superlinearly.
+
+    Args:
+        f: Continuous scalar function
+        a: Lower end of the bracket
+        b: Upper end of the bracket
+        xtol: Absolute tolerance on the root
+        maxiter: Maximum number of iterations
+
+    Returns:
+        The root location
+
+    Raises:
+        ValueError: If f(a) and f(b) have the same sign
+    """
+    fa, fb = f(a), f(b)
+    if fa == 0:
+        return a
+    if fb == 0:
+        return b
+    if fa * fb > 0:
+        raise ValueError("Root is not bracketed")
+
+    c, fc = a, fa
+    d = e = b - a
+    for _ in range(maxiter):
+        if fb * fc > 0:
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+
+        tol = 2 * np.finfo(float).eps * abs(b) + 0.5 * xtol
+        m = 0.5 * (c - b)
+        if abs(m) <= tol or fb == 0:
+            return b
+
+        if abs(e) >= tol and abs(fa) > abs(fb):
+            # Attempt interpolation
+            s = fb / fa
+            if a == c:
+                p = 2 * m * s
+                q = 1 - s
+            else:
+                q = fa / fc
+                r = fb / fc
+                p = s * (2 * m * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0:
+                q = -q
+            else:
+                p = -p
+            if 2 * p < min(3 * m * q - abs(tol * q), abs(e * q)):
+                e = d
+                d = p / q
+            else:
+                d = e = m
+        else:
+            # Fall back to bisection
+            d = e = m
+
+        a, fa = b, fb
+        b += d if abs(d) > tol else (tol if m > 0 else -tol)
+        fb = f(b)
+
+    return b
+
+
+def solve_crossover(
     inputs: ProvidentInputs,
     min_age: int = 18,
     max_age: int = 59,
-) -> ComparisonSummary:
+    xtol: float = 1e-6,
+) -> CrossoverSolution:
     """
-    Run a complete comparison across all starting ages.
+    Solve for the crossover as both an integer and a fractional starting age.
+
+    The integer crossover is bracketed with a single vectorized evaluation
+    of the closed-form net values over the age range. Brent's method then
+    finds the horizon where provident_net == personal_net between the
+    crossover age and the age before it.
 
     Args:
         inputs: All input parameters
-        min_age: Minimum starting age to analyze
-        max_age: Maximum starting age to analyze
+        min_age: Minimum age to consider
+        max_age: Maximum age to consider
+        xtol: Absolute tolerance on the continuous horizon, in years
 
     Returns:
-        ComparisonSummary with results for all ages
+        CrossoverSolution with the integer and continuous crossover
     """
-    age_results = []
-    
-    for age in range(min_age, max_age + 1):
-        result = calculate_comparison_for_starting_age(age, inputs)
-        age_results.append(result)
-    
-    crossover_age = find_crossover_age(inputs, min_age, max_age)
+    starting_ages = np.arange(min_age, max_age + 1)
+    differences = calculate_net_difference(inputs, inputs.retirement_age - starting_ages)
+    crossover_age, _ = find_crossover_ages(starting_ages, differences)
+
+    if crossover_age is None or crossover_age == min_age:
+        # Never wins, or already wins at the edge: no sign change to refine
+        return CrossoverSolution(
+            crossover_age=crossover_age,
+            continuous_age=None,
+            continuous_years=None,
+        )
+
+    # Provident wins at crossover_age but not one year earlier (longer horizon)
+    continuous_years = _refine_crossover_years(
+        inputs, float(inputs.retirement_age - crossover_age), xtol
+    )
+
+    return CrossoverSolution(
+        crossover_age=crossover_age,
+        continuous_age=inputs.retirement_age - continuous_years,
+        continuous_years=continuous_years,
+    )
+
+
+def _refine_crossover_years(
+    inputs: ProvidentInputs,
+    win_years: float,
+    xtol: float = 1e-6,
+) -> float:
+    """
+    Root-find the crossover horizon inside a one-year bracket.
+
+    Provident must win at win_years and not at win_years + 1, so only
+    scalar horizons inside that bracket are evaluated.
+
+    Args:
+        inputs: All input parameters
+        win_years: Shortest bracketing horizon, at which Provident wins
+        xtol: Absolute tolerance on the horizon, in years
+
+    Returns:
+        Horizon in years where provident_net == personal_net
+    """
+    return float(_brentq(
+        lambda years: float(calculate_net_difference(inputs, years)),
+        win_years,
+        win_years + 1,
+        xtol=xtol,
+    ))
+
+
+def build_summary(
+    inputs: ProvidentInputs,
+    arrays: dict[str, np.ndarray],
+) -> ComparisonSummary:
+    """Build a ComparisonSummary from per-age comparison arrays."""
+    age_results = AgeResultsTable(
+        arrays,
+        retirement_age=inputs.retirement_age,
+        withdrawal_mode=inputs.withdrawal_mode,
+    )
+
+    # Crossovers come from the arrays already computed, not a second scan
+    crossover_age, crossover_ages = find_crossover_ages(
+        arrays["starting_age"], arrays["provident_net"] - arrays["personal_net"]
+    )
     
     return ComparisonSummary(
         inputs=inputs,
@@ -318,12 +789,145 @@ def run_full_comparison(
         crossover_age=crossover_age,
         provident_net_return=inputs.get_provident_net_return(),
         personal_net_return=inputs.get_personal_net_return(),
+        crossover_ages=crossover_ages,
+    )
+
+
+def run_full_comparison(
+    inputs: ProvidentInputs,
+    min_age: int = 18,
+    max_age: int = 59,
+) -> ComparisonSummary:
+    """
+    Run a complete comparison across all starting ages.
+
+    Args:
+        inputs: All input parameters
+        min_age: Minimum starting age to analyze
+        max_age: Maximum starting age to analyze
+
+    Returns:
+        ComparisonSummary with results for all ages
+    """
+    arrays = calculate_comparison_arrays(inputs, min_age, max_age)
+    return build_summary(inputs, arrays)
+
+
+def run_multi_mode_comparison(
+    inputs: ProvidentInputs,
+    withdrawal_modes: tuple[str, ...] = ("annuity", "lump_sum"),
+    min_age: int = 18,
+    max_age: int = 59,
+) -> dict[str, ComparisonSummary]:
+    """
+    Run the full comparison under several withdrawal modes at once.
+
+    The accumulation phase is identical for every mode, so it is computed
+    once and only the Provident tax policy is applied per mode.
+
+    Args:
+        inputs: All input parameters (its withdrawal_mode is ignored)
+        withdrawal_modes: Withdrawal modes to evaluate
+        min_age: Minimum starting age to analyze
+        max_age: Maximum starting age to analyze
+
+    Returns:
+        Dictionary mapping each withdrawal mode to its ComparisonSummary
+    """
+    starting_ages = np.arange(min_age, max_age + 1)
+    investment_years = np.maximum(inputs.retirement_age - starting_ages, 0)
+    accumulation = accumulate_inputs(inputs, investment_years)
+
+    summaries = {}
+    for withdrawal_mode in withdrawal_modes:
+        mode_inputs = replace(inputs, withdrawal_mode=withdrawal_mode)
+        arrays = {
+            "starting_age": starting_ages,
+            "investment_years": investment_years,
+            **apply_taxes(
+                accumulation,
+                capital_gains_tax=inputs.capital_gains_tax,
+                annuity_exempt=is_annuity_exempt(withdrawal_mode, inputs.retirement_age),
+            ),
+        }
+        summaries[withdrawal_mode] = build_summary(mode_inputs, arrays)
+
+    return summaries
+
+
+def _run_comparison_chunk(
+    inputs_chunk: list[ProvidentInputs],
+    min_age: int,
+    max_age: int,
+) -> list[ComparisonSummary]:
+    """Run the full comparison for a chunk of profiles."""
+    return [run_full_comparison(inputs, min_age, max_age) for inputs in inputs_chunk]
+
+
+def run_batch_comparison(
+    inputs_list: list[ProvidentInputs],
+    min_age: int = 18,
+    max_age: int = 59,
+    executor: Optional[Executor] = None,
+    chunk_size: Optional[int] = None,
+) -> list[ComparisonSummary]:
+    """
+    Run the full comparison for many profiles.
+
+    Args:
+        inputs_list: Input parameters for each profile
+        min_age: Minimum starting age to analyze
+        max_age: Maximum starting age to analyze
+        executor: Executor to spread profiles over (serial if None)
+        chunk_size: Profiles per task
+
+    Returns:
+        ComparisonSummary for each profile, in input order
+    """
+    return map_chunks(
+        partial(_run_comparison_chunk, min_age=min_age, max_age=max_age),
+        list(inputs_list),
+        executor=executor,
+        chunk_size=chunk_size,
     )
 
 
+def calculate_growth_trajectory(
+    inputs: ProvidentInputs,
+    starting_age: Optional[int] = None,
+) -> dict[str, np.ndarray]:
+    """
+    Calculate year-by-year balances from a starting age in one NumPy pass.
+
+    Args:
+        inputs: All input parameters
+        starting_age: Age at the first contribution (defaults to current age)
+
+    Returns:
+        Dictionary of arrays keyed by YearlyGrowthTable column, one entry
+        per year until retirement (empty if already retired)
+    """
+    if starting_age is None:
+        starting_age = inputs.current_age
+    years = np.arange(1, max(inputs.retirement_age - starting_age, 0) + 1)
+
+    # Use the same contribution for both accounts (apples-to-apples comparison)
+    contribution = inputs.annual_contribution
+    contributions = contribution * years.astype(float)
+
+    return {
+        "year": years,
+        "age": starting_age + years,
+        "provident_fv": contribution * annuity_factor(inputs.get_provident_net_return(), years),
+        "provident_contributions": contributions,
+        "personal_fv": contribution * annuity_factor(inputs.get_personal_net_return(), years),
+        "personal_contributions": contributions,
+    }
+
+
 def generate_yearly_growth(
     inputs: ProvidentInputs,
-) -> list[YearlyResult]:
+) -> YearlyGrowthTable:
     """
     Generate year-by-year growth data for visualization.
 
@@ -331,44 +935,54 @@ def generate_yearly_growth(
         inputs: All input parameters
 
     Returns:
-        List of YearlyResult for each year from current age to retirement
+        YearlyGrowthTable with one row per year from current age to retirement
     """
-    results = []
-    investment_years = inputs.get_investment_years()
-    
-    if investment_years <= 0:
-        return results
-    
-    # Use the same contribution for both accounts (apples-to-apples comparison)
-    provident_contribution = inputs.annual_contribution
-    personal_contribution = inputs.annual_contribution
+    return YearlyGrowthTable(calculate_growth_trajectory(inputs))
 
-    provident_net_return = inputs.get_provident_net_return()
-    personal_net_return = inputs.get_personal_net_return()
 
-    for year in range(1, investment_years + 1):
-        age = inputs.current_age + year
-        
-        provident_fv = calculate_future_value(
-            provident_contribution, provident_net_return, year
-        )
-        provident_contributions = provident_contribution * year
-        
-        personal_fv = calculate_future_value(
-            personal_contribution, personal_net_return, year
+def calculate_growth_matrix(
+    inputs: ProvidentInputs,
+    min_age: int = 18,
+    max_age: int = 59,
+) -> dict[str, np.ndarray]:
+    """
+    Calculate growth trajectories for every starting age at once.
+
+    The balance after n years does not depend on the starting age, so one
+    row of growth factors is broadcast over all ages and cells past each
+    age's retirement are masked.
+
+    Args:
+        inputs: All input parameters
+        min_age: Minimum starting age
+        max_age: Maximum starting age
+
+    Returns:
+        Dictionary with "starting_age" (ages,), "year" (years,) and
+        (ages x years) arrays "age", "provident_fv", "personal_fv" and
+        "contributions"; cells past retirement are NaN
+    """
+    starting_ages = np.arange(min_age, max_age + 1)
+    horizons = np.maximum(inputs.retirement_age - starting_ages, 0)
+    years = np.arange(1, int(horizons.max(initial=0)) + 1)
+    active = years[None, :] <= horizons[:, None]
+
+    trajectory = calculate_growth_trajectory(inputs, starting_age=inputs.retirement_age - len(years))
+    masked = {
+        name: np.where(active, trajectory[column][None, :], np.nan)
+        for name, column in (
+            ("provident_fv", "provident_fv"),
+            ("personal_fv", "personal_fv"),
+            ("contributions", "provident_contributions"),
         )
-        personal_contributions = personal_contribution * year
-        
-        results.append(YearlyResult(
-            year=year,
-            age=age,
-            provident_fv=provident_fv,
-            provident_contributions=provident_contributions,
-            personal_fv=personal_fv,
-            personal_contributions=personal_contributions,
-        ))
-    
-    return results
+    }
+
+    return {
+        "starting_age": starting_ages,
+        "year": years,
+        "age": starting_ages[:, None] + years[None, :],
+        **masked,
+    }
 
 
 def generate_comparison_dataframe(
@@ -383,36 +997,58 @@ def generate_comparison_dataframe(
     Returns:
         DataFrame with comparison data by starting age
     """
-    data = []
-    for result in summary.age_results:
-        data.append({
-            "Starting Age": result.starting_age,
-            "Years to Invest": result.investment_years,
-            "Provident Gross": result.provident_gross,
-            "Provident Tax": result.provident_tax,
-            "Provident Net": result.provident_net,
-            "Personal Gross": result.personal_gross,
-            "Personal Tax": result.personal_tax,
-            "Personal Net": result.personal_net,
-            "Difference": result.difference,
-            "Difference %": result.difference_pct,
-            "Winner": result.winner,
-        })
-    return pd.DataFrame(data)
+    table = summary.age_results
+    provident_net = table.column("provident_net")
+    personal_net = table.column("personal_net")
+    difference = table.difference
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        difference_pct = np.where(personal_net == 0, 0.0, difference / personal_net * 100)
+
+    return pd.DataFrame({
+        "Starting Age": table.column("starting_age"),
+        "Years to Invest": table.column("investment_years"),
+        "Provident Gross": table.column("provident_gross"),
+        "Provident Tax": table.column("provident_tax"),
+        "Provident Net": provident_net,
+        "Personal Gross": table.column("personal_gross"),
+        "Personal Tax": table.column("personal_tax"),
+        "Personal Net": personal_net,
+        "Difference": difference,
+        "Difference %": difference_pct,
+        "Winner": np.select(
+            [difference > 0, difference < 0],
+            ["Provident Fund", "Personal Account"],
+            default="Tie",
+        ),
+    })
 
 
 def generate_yearly_dataframe(
-    yearly_results: list[YearlyResult],
+    yearly_results: Union[YearlyGrowthTable, list[YearlyResult]],
 ) -> pd.DataFrame:
     """
     Generate a pandas DataFrame from yearly growth results.
 
     Args:
-        yearly_results: List of YearlyResult
+        yearly_results: YearlyGrowthTable or list of YearlyResult
 
     Returns:
         DataFrame with yearly growth data
     """
+    if isinstance(yearly_results, YearlyGrowthTable):
+        columns = yearly_results.columns
+        return pd.DataFrame({
+            "Year": columns["year"],
+            "Age": columns["age"],
+            "Provident Balance": columns["provident_fv"],
+            "Provident Contributions": columns["provident_contributions"],
+            "Provident Gain": yearly_results.provident_gain,
+            "Personal Balance": columns["personal_fv"],
+            "Personal Contributions": columns["personal_contributions"],
+            "Personal Gain": yearly_results.personal_gain,
+        })
+
     data = []
     for yr in yearly_results:
         data.append({
@@ -428,10 +1064,117 @@ def generate_yearly_dataframe(
     return pd.DataFrame(data)
 
 
+DEFAULT_SENSITIVITY_RETURNS = [0.04, 0.05, 0.06, 0.07, 0.08, 0.09, 0.10]
+DEFAULT_SENSITIVITY_INFLATION = [0.01, 0.02, 0.025, 0.03, 0.04]
+
+
+def _evaluate_sensitivity_rows(
+    return_rates: np.ndarray,
+    base_inputs: ProvidentInputs,
+    inflation_rates: np.ndarray,
+    investment_years: np.ndarray,
+) -> list[tuple[np.ndarray, np.ndarray]]:
+    """
+    Evaluate a block of return-rate rows of the sensitivity tensor.
+
+    Args:
+        return_rates: Return rates for this block of rows
+        base_inputs: Base input parameters
+        inflation_rates: Inflation rates (columns)
+        investment_years: Horizon for each starting age
+
+    Returns:
+        One (provident_net, personal_net) pair of (inflation x age) arrays per return rate
+    """
+    # Axes: (return, inflation, starting age)
+    returns_axis = np.asarray(return_rates, dtype=float)[:, None, None]
+    accumulation = accumulate(
+        contribution=base_inputs.annual_contribution,
+        provident_net_return=(1 + returns_axis) * (1 - base_inputs.provident_mgmt_fee) - 1,
+        personal_net_return=(1 + returns_axis) * (1 - base_inputs.personal_mgmt_fee) - 1,
+        inflation_rate=inflation_rates[None, :, None],
+        investment_years=investment_years[None, None, :],
+    )
+    values = apply_taxes(
+        accumulation,
+        capital_gains_tax=base_inputs.capital_gains_tax,
+        annuity_exempt=is_annuity_exempt(base_inputs.withdrawal_mode, base_inputs.retirement_age),
+    )
+
+    shape = (len(returns_axis), len(inflation_rates), len(investment_years))
+    provident_net = np.broadcast_to(values["provident_net"], shape)
+    personal_net = np.broadcast_to(values["personal_net"], shape)
+    return list(zip(provident_net, personal_net))
+
+
+def evaluate_sensitivity_grid(
+    base_inputs: ProvidentInputs,
+    return_rates: list[float] = None,
+    inflation_rates: list[float] = None,
+    min_age: int = 18,
+    max_age: int = 59,
+    executor: Optional[Executor] = None,
+    chunk_size: Optional[int] = None,
+) -> SensitivityGrid:
+    """
+    Evaluate net values over a (return x inflation x starting-age) tensor.
+
+    The same expected return is used for both accounts in each cell, with
+    the base inputs' fees. Everything is computed with NumPy broadcasting
+    in one shot; crossover ages and advantage-at-age slices are derived
+    from the resulting tensor. With an executor, blocks of return-rate rows
+    are evaluated in parallel and reassembled in order.
+
+    Args:
+        base_inputs: Base input parameters
+        return_rates: List of return rates to test
+        inflation_rates: List of inflation rates to test
+        min_age: Minimum starting age to analyze
+        max_age: Maximum starting age to analyze
+        executor: Executor to spread return-rate rows over (serial if None)
+        chunk_size: Return-rate rows per task
+
+    Returns:
+        SensitivityGrid with net values for every cell and starting age
+    """
+    if return_rates is None:
+        return_rates = DEFAULT_SENSITIVITY_RETURNS
+    
+    if inflation_rates is None:
+        inflation_rates = DEFAULT_SENSITIVITY_INFLATION
+
+    returns = np.asarray(return_rates, dtype=float)
+    inflations = np.asarray(inflation_rates, dtype=float)
+    starting_ages = np.arange(min_age, max_age + 1)
+    investment_years = np.maximum(base_inputs.retirement_age - starting_ages, 0)
+
+    rows = map_chunks(
+        partial(
+            _evaluate_sensitivity_rows,
+            base_inputs=base_inputs,
+            inflation_rates=inflations,
+            investment_years=investment_years,
+        ),
+        returns,
+        executor=executor,
+        chunk_size=chunk_size,
+    )
+
+    shape = (len(returns), len(inflations), len(starting_ages))
+    return SensitivityGrid(
+        return_rates=returns,
+        inflation_rates=inflations,
+        starting_ages=starting_ages,
+        provident_net=np.array([provident for provident, _ in rows]).reshape(shape),
+        personal_net=np.array([personal for _, personal in rows]).reshape(shape),
+    )
+
+
 def generate_sensitivity_analysis(
     base_inputs: ProvidentInputs,
     return_rates: list[float] = None,
     inflation_rates: list[float] = None,
+    executor: Optional[Executor] = None,
 ) -> list[SensitivityPoint]:
     """
     Generate sensitivity analysis data.
@@ -440,61 +1183,27 @@ def generate_sensitivity_analysis(
         base_inputs: Base input parameters
         return_rates: List of return rates to test
         inflation_rates: List of inflation rates to test
+        executor: Executor to run the sweep on (serial if None)
 
     Returns:
         List of SensitivityPoint for each combination
     """
-    if return_rates is None:
-        return_rates = [0.04, 0.05, 0.06, 0.07, 0.08, 0.09, 0.10]
-    
-    if inflation_rates is None:
-        inflation_rates = [0.01, 0.02, 0.025, 0.03, 0.04]
-    
+    grid = evaluate_sensitivity_grid(
+        base_inputs, return_rates, inflation_rates, executor=executor
+    )
+    crossover_ages = grid.crossover_age_matrix()
+    advantage_at_30 = grid.advantage_at(30)
+
     results = []
     
-    for ret in return_rates:
-        for inf in inflation_rates:
-            # Create modified inputs (use same return for both in sensitivity analysis)
-            modified_inputs = ProvidentInputs(
-                current_age=base_inputs.current_age,
-                retirement_age=base_inputs.retirement_age,
-                life_expectancy=base_inputs.life_expectancy,
-                annual_contribution=base_inputs.annual_contribution,
-                annual_cap=base_inputs.annual_cap,
-                provident_expected_return=ret,
-                personal_expected_return=ret,  # Same return for sensitivity analysis
-                inflation_rate=inf,
-                provident_mgmt_fee=base_inputs.provident_mgmt_fee,
-                personal_mgmt_fee=base_inputs.personal_mgmt_fee,
-                capital_gains_tax=base_inputs.capital_gains_tax,
-                withdrawal_mode=base_inputs.withdrawal_mode,
-            )
-            
-            # Find crossover
-            crossover = find_crossover_age(modified_inputs)
-            
-            # Calculate advantage at age 30
-            test_inputs = ProvidentInputs(
-                current_age=30,
-                retirement_age=base_inputs.retirement_age,
-                life_expectancy=base_inputs.life_expectancy,
-                annual_contribution=base_inputs.annual_contribution,
-                annual_cap=base_inputs.annual_cap,
-                provident_expected_return=ret,
-                personal_expected_return=ret,
-                inflation_rate=inf,
-                provident_mgmt_fee=base_inputs.provident_mgmt_fee,
-                personal_mgmt_fee=base_inputs.personal_mgmt_fee,
-                capital_gains_tax=base_inputs.capital_gains_tax,
-                withdrawal_mode=base_inputs.withdrawal_mode,
-            )
-            result_at_30 = calculate_comparison_for_starting_age(30, test_inputs)
-            
+    for i, ret in enumerate(grid.return_rates.tolist()):
+        for j, inf in enumerate(grid.inflation_rates.tolist()):
+            crossover = crossover_ages[i, j]
             results.append(SensitivityPoint(
                 return_rate=ret,
                 inflation_rate=inf,
-                crossover_age=crossover,
-                provident_advantage_at_30=result_at_30.difference,
+                crossover_age=None if np.isnan(crossover) else int(crossover),
+                provident_advantage_at_30=float(advantage_at_30[i, j]),
             ))
     
     return results
@@ -504,6 +1213,8 @@ def generate_sensitivity_matrix(
     base_inputs: ProvidentInputs,
     return_rates: list[float] = None,
     inflation_rates: list[float] = None,
+    continuous: bool = False,
+    executor: Optional[Executor] = None,
 ) -> pd.DataFrame:
     """
     Generate a sensitivity matrix as a DataFrame.
@@ -514,36 +1225,38 @@ def generate_sensitivity_matrix(
         base_inputs: Base input parameters
         return_rates: List of return rates to test
         inflation_rates: List of inflation rates to test
+        continuous: Show the fractional crossover age (float) from a root
+            search in each cell's bracketing year instead of the whole
+            starting age (int)
+        executor: Executor to run the sweep on (serial if None)
 
     Returns:
         DataFrame with return rates as rows and inflation rates as columns
     """
-    if return_rates is None:
-        return_rates = [0.04, 0.05, 0.06, 0.07, 0.08, 0.09, 0.10]
-    
-    if inflation_rates is None:
-        inflation_rates = [0.01, 0.02, 0.025, 0.03, 0.04]
-    
+    grid = evaluate_sensitivity_grid(
+        base_inputs, return_rates, inflation_rates, executor=executor
+    )
+    crossover_ages = grid.crossover_age_matrix()
+    min_age = int(grid.starting_ages[0])
+
     data = []
-    for ret in return_rates:
+    for i, ret in enumerate(grid.return_rates.tolist()):
         row = {"Return": f"{ret*100:.0f}%"}
-        for inf in inflation_rates:
-            modified_inputs = ProvidentInputs(
-                current_age=base_inputs.current_age,
-                retirement_age=base_inputs.retirement_age,
-                life_expectancy=base_inputs.life_expectancy,
-                annual_contribution=base_inputs.annual_contribution,
-                annual_cap=base_inputs.annual_cap,
-                provident_expected_return=ret,
-                personal_expected_return=ret,  # Same return for sensitivity matrix
-                inflation_rate=inf,
-                provident_mgmt_fee=base_inputs.provident_mgmt_fee,
-                personal_mgmt_fee=base_inputs.personal_mgmt_fee,
-                capital_gains_tax=base_inputs.capital_gains_tax,
-                withdrawal_mode=base_inputs.withdrawal_mode,
-            )
-            crossover = find_crossover_age(modified_inputs)
-            row[f"Inflation {inf*100:.1f}%"] = crossover if crossover else "Never"
+        for j, inf in enumerate(grid.inflation_rates.tolist()):
+            crossover = None if np.isnan(crossover_ages[i, j]) else int(crossover_ages[i, j])
+            if continuous and crossover is not None:
+                if crossover > min_age:
+                    # The grid's sign change brackets the root; search only that year
+                    cell_inputs = replace(
+                        base_inputs,
+                        provident_expected_return=ret,
+                        personal_expected_return=ret,
+                        inflation_rate=inf,
+                    )
+                    win_years = float(base_inputs.retirement_age - crossover)
+                    crossover = base_inputs.retirement_age - _refine_crossover_years(cell_inputs, win_years)
+                crossover = round(float(crossover), 2)
+            row[f"Inflation {inf*100:.1f}%"] = "Never" if crossover is None else crossover
         data.append(row)
     
     df = pd.DataFrame(data)
@@ -637,65 +1350,110 @@ def calculate_monthly_withdrawal(
 
 def calculate_monthly_withdrawal_comparison(
     inputs: ProvidentInputs,
+    withdrawal_return: float = DEFAULT_WITHDRAWAL_RETURN,
+    cost_basis_method: str = "fifo",
 ) -> MonthlyWithdrawalResult:
     """
     Calculate monthly withdrawal comparison between provident fund and personal account.
     
     For provident fund annuity (קצבה): 0% tax on withdrawals after age 60
-    For personal account: 25% capital gains tax on the gains portion of each withdrawal
+    For personal account: 25% capital gains tax on the gain realized by each
+    withdrawal, tracked month by month against the cost basis
     
     Args:
         inputs: All input parameters
+        withdrawal_return: Expected annual return during the withdrawal period
+        cost_basis_method: "fifo" or "average" cost basis for the personal account
         
     Returns:
         MonthlyWithdrawalResult with comparison details
     """
     # Get the comparison result at retirement
     result = calculate_comparison_for_starting_age(inputs.current_age, inputs)
-    
+
+    return calculate_withdrawal_from_balances(
+        provident_balance=result.provident_gross,
+        provident_contributions=result.provident_contributions,
+        personal_balance=result.personal_gross,
+        personal_contributions=result.personal_contributions,
+        inputs=inputs,
+        withdrawal_return=withdrawal_return,
+        cost_basis_method=cost_basis_method,
+    )
+
+
+def calculate_withdrawal_from_balances(
+    provident_balance: float,
+    provident_contributions: float,
+    personal_balance: float,
+    personal_contributions: float,
+    inputs: ProvidentInputs,
+    withdrawal_return: float = DEFAULT_WITHDRAWAL_RETURN,
+    cost_basis_method: str = "fifo",
+) -> MonthlyWithdrawalResult:
+    """
+    Run the withdrawal phase from balances at retirement.
+
+    The personal account holds one lot per annual deposit; the lots are
+    scaled to the given balance and contributions.
+
+    Args:
+        provident_balance: Provident gross balance at retirement
+        provident_contributions: Total Provident contributions
+        personal_balance: Personal gross balance at retirement
+        personal_contributions: Total personal contributions
+        inputs: All input parameters (life expectancy, tax rate and the
+            personal deposit schedule are used)
+        withdrawal_return: Expected annual return during the withdrawal period
+        cost_basis_method: "fifo" or "average" cost basis for the personal account
+
+    Returns:
+        MonthlyWithdrawalResult with comparison details
+    """
     # Calculate withdrawal period
     withdrawal_years = inputs.life_expectancy - inputs.retirement_age
     if withdrawal_years <= 0:
         withdrawal_years = 1  # Minimum 1 year
-    
-    # Use a conservative return during withdrawal (lower than accumulation phase)
-    # Typically 3-4% is assumed for retirement withdrawals
-    withdrawal_return = 0.03  # 3% conservative return during withdrawal
-    
-    # Calculate gross monthly withdrawals
-    provident_gross_monthly = calculate_monthly_withdrawal(
-        result.provident_gross, withdrawal_years, withdrawal_return
-    )
-    personal_gross_monthly = calculate_monthly_withdrawal(
-        result.personal_gross, withdrawal_years, withdrawal_return
+
+    # Provident fund annuity: 0% tax (after age 60), so a single lot suffices
+    provident_drawdown = simulate_decumulation(
+        [provident_balance], [provident_contributions], withdrawal_years,
+        annual_return=withdrawal_return, tax_rate=0.0, cost_basis_method=cost_basis_method,
     )
-    
-    # Provident fund annuity: 0% tax (after age 60)
+    provident_gross_monthly = float(provident_drawdown.gross_monthly)
     provident_net_monthly = provident_gross_monthly  # No tax on annuity
-    
-    # Personal account: 25% tax on gains portion
-    # Calculate the gain ratio (what portion of the balance is gains vs contributions)
-    if result.personal_gross > 0:
-        gain_ratio = (result.personal_gross - result.personal_contributions) / result.personal_gross
+
+    # Personal account: tax on the gain realized by each withdrawal
+    lot_values, lot_costs = annual_deposit_lots(
+        inputs.annual_contribution, inputs.get_personal_net_return(), inputs.get_investment_years()
+    )
+    if lot_values.sum() > 0:
+        lot_values = lot_values * (personal_balance / lot_values.sum())
+        lot_costs = lot_costs * (personal_contributions / lot_costs.sum())
     else:
-        gain_ratio = 0.0
-    
-    # Each withdrawal is proportionally gains + principal
-    # Only the gains portion is taxed at 25%
-    taxable_per_month = personal_gross_monthly * gain_ratio
-    tax_per_month = taxable_per_month * inputs.capital_gains_tax
+        lot_values, lot_costs = np.array([personal_balance]), np.array([personal_contributions])
+    personal_drawdown = simulate_decumulation(
+        lot_values, lot_costs, withdrawal_years,
+        annual_return=withdrawal_return,
+        tax_rate=inputs.capital_gains_tax,
+        cost_basis_method=cost_basis_method,
+    )
+    personal_gross_monthly = float(personal_drawdown.gross_monthly)
+    tax_per_month = float(personal_drawdown.mean_tax_monthly)
     personal_net_monthly = personal_gross_monthly - tax_per_month
     
     return MonthlyWithdrawalResult(
-        provident_balance=result.provident_gross,
-        provident_contributions=result.provident_contributions,
+        provident_balance=provident_balance,
+        provident_contributions=provident_contributions,
         provident_gross_monthly=provident_gross_monthly,
         provident_net_monthly=provident_net_monthly,
-        personal_balance=result.personal_gross,
-        personal_contributions=result.personal_contributions,
+        personal_balance=personal_balance,
+        personal_contributions=personal_contributions,
         personal_gross_monthly=personal_gross_monthly,
         personal_net_monthly=personal_net_monthly,
         personal_tax_per_month=tax_per_month,
         withdrawal_years=withdrawal_years,
         withdrawal_return=withdrawal_return,
+        personal_drawdown=personal_drawdown,
+        provident_drawdown=provident_drawdown,
     )
@@ -0,0 +1,256 @@
+"""Headless batch scoring of many client profiles.
+
+Reads ProvidentInputs rows from CSV or Parquet in chunks, scores each row
+(comparison at the client's current age, crossover age and monthly
+withdrawal), and writes the results as a columnar file. Chunks are fanned
+out to an executor (a process pool by default) and written in input order.
+
+Rows are scored on the cap-eligible contribution, min(annual_contribution,
+annual_cap): money above the cap goes to the personal account under either
+choice, so it does not change the comparison. Overriding the cap therefore
+re-scores every row.
+
+Usage:
+    python -m src.cli clients.csv scores.parquet --workers 8
+    python -m src.cli clients.parquet scores.csv --annual-cap 85000
+
+Parquet input/output requires pyarrow.
+"""
+
+import argparse
+import os
+import sys
+import time
+from dataclasses import fields, replace
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from .models import ProvidentInputs
+from .calculator import (
+    evaluate_horizons,
+    calculate_comparison_arrays,
+    calculate_monthly_withdrawal_comparison,
+    find_crossover_ages,
+)
+from .executors import EXECUTOR_KINDS, get_executor
+
+
+DEFAULT_CHUNK_SIZE = 5_000  # Rows per chunk sent to a worker
+
+INPUT_COLUMNS = [f.name for f in fields(ProvidentInputs)]
+INT_COLUMNS = {"current_age", "retirement_age", "life_expectancy"}
+
+# Fixed result dtypes, so every chunk (even an empty one) writes the same schema
+RESULT_DTYPES = {
+    "scored_contribution": "float64",
+    "crossover_age": "Int64",  # Nullable: no crossover in the 18-59 grid
+    "provident_net": "float64",
+    "personal_net": "float64",
+    "difference": "float64",
+    "provident_net_monthly": "float64",
+    "personal_net_monthly": "float64",
+    "monthly_difference": "float64",
+}
+
+
+def _row_to_inputs(row: dict) -> ProvidentInputs:
+    """Build ProvidentInputs from one input row."""
+    return ProvidentInputs(**{
+        name: int(row[name]) if name in INT_COLUMNS
+        else str(row[name]) if name == "withdrawal_mode"
+        else float(row[name])
+        for name in INPUT_COLUMNS
+    })
+
+
+def score_frame(
+    frame: pd.DataFrame,
+    annual_cap: Optional[float] = None,
+) -> pd.DataFrame:
+    """
+    Score every row of a DataFrame of ProvidentInputs.
+
+    Each row is scored on its cap-eligible contribution, reported in the
+    scored_contribution column. Net values are for the client's own
+    horizon (any current age); the 18-59 starting-age grid is used only
+    for the crossover search.
+
+    Args:
+        frame: DataFrame with one column per ProvidentInputs field
+        annual_cap: Override for the annual cap of every row
+
+    Returns:
+        DataFrame with the input columns followed by the result columns
+    """
+    frame = frame.copy()
+    if annual_cap is not None:
+        frame["annual_cap"] = annual_cap
+
+    missing = [name for name in INPUT_COLUMNS if name not in frame.columns]
+    if missing:
+        raise ValueError(f"Missing input columns: {', '.join(missing)}")
+
+    results = {name: [] for name in RESULT_DTYPES}
+
+    for row in frame[INPUT_COLUMNS].to_dict("records"):
+        inputs = _row_to_inputs(row)
+        # Only the part under the cap is a Provident-or-personal choice
+        inputs = replace(inputs, annual_contribution=inputs.get_effective_contribution())
+
+        arrays = calculate_comparison_arrays(inputs)
+        crossover_age, _ = find_crossover_ages(
+            arrays["starting_age"], arrays["provident_net"] - arrays["personal_net"]
+        )
+        current = evaluate_horizons(inputs, np.array([float(inputs.get_investment_years())]))
+        provident_net = float(current["provident_net"][0])
+        personal_net = float(current["personal_net"][0])
+
+        withdrawal = calculate_monthly_withdrawal_comparison(inputs)
+
+        results["scored_contribution"].append(inputs.annual_contribution)
+        results["crossover_age"].append(crossover_age)
+        results["provident_net"].append(provident_net)
+        results["personal_net"].append(personal_net)
+        results["difference"].append(provident_net - personal_net)
+        results["provident_net_monthly"].append(withdrawal.provident_net_monthly)
+        results["personal_net_monthly"].append(withdrawal.personal_net_monthly)
+        results["monthly_difference"].append(withdrawal.monthly_difference)
+
+    scored = pd.DataFrame(results, index=frame.index).astype(RESULT_DTYPES)
+    return pd.concat([frame, scored], axis=1)
+
+
+def _read_chunks(path: Path, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Stream an input file as DataFrame chunks."""
+    if path.suffix.lower() == ".parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+class _ChunkWriter:
+    """Append scored chunks to a CSV or Parquet file."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.parquet = path.suffix.lower() == ".parquet"
+        self._writer = None
+        self._wrote_header = False
+
+    def write(self, frame: pd.DataFrame) -> None:
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            frame.to_csv(self.path, mode="a" if self._wrote_header else "w",
+                         header=not self._wrote_header, index=False)
+            self._wrote_header = True
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+def score_file(
+    input_path: Path,
+    output_path: Path,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: Optional[int] = None,
+    annual_cap: Optional[float] = None,
+    progress: bool = True,
+    executor_kind: str = "process",
+) -> int:
+    """
+    Score an input file chunk by chunk and write the results.
+
+    At most twice as many chunks as workers are in flight at once, so
+    memory stays bounded regardless of the input size.
+
+    Args:
+        input_path: CSV or Parquet file of ProvidentInputs rows
+        output_path: CSV or Parquet output file
+        chunk_size: Rows per chunk
+        workers: Number of worker processes (defaults to the CPU count)
+        annual_cap: Override for the annual cap of every row
+        progress: Whether to report progress on stderr
+        executor_kind: "serial", "thread" or "process"
+
+    Returns:
+        Number of rows scored
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = 2 * workers
+    writer = _ChunkWriter(output_path)
+    rows = 0
+    started = time.perf_counter()
+
+    with get_executor(executor_kind, workers) as executor:
+        pending = []
+
+        def drain(limit: int) -> None:
+            nonlocal rows
+            while len(pending) > limit:
+                scored = pending.pop(0).result()
+                writer.write(scored)
+                rows += len(scored)
+                if progress:
+                    elapsed = time.perf_counter() - started
+                    print(f"Scored {rows:,} rows ({rows / elapsed:,.0f} rows/s)",
+                          file=sys.stderr)
+
+        try:
+            for chunk in _read_chunks(input_path, chunk_size):
+                pending.append(executor.submit(score_frame, chunk, annual_cap))
+                drain(max_in_flight)
+            drain(0)
+        finally:
+            writer.close()
+
+    return rows
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        description="Score client profiles: Provident Fund vs personal account.",
+    )
+    parser.add_argument("input", type=Path, help="CSV or Parquet file of ProvidentInputs rows")
+    parser.add_argument("output", type=Path, help="CSV or Parquet output file")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Rows per chunk (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: CPU count)")
+    parser.add_argument("--executor", choices=EXECUTOR_KINDS, default="process",
+                        help="Execution backend (default: %(default)s)")
+    parser.add_argument("--annual-cap", type=float, default=None,
+                        help="Override the annual cap for every row")
+    parser.add_argument("--quiet", action="store_true", help="Do not report progress")
+    args = parser.parse_args(argv)
+
+    rows = score_file(
+        args.input,
+        args.output,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        annual_cap=args.annual_cap,
+        progress=not args.quiet,
+        executor_kind=args.executor,
+    )
+    if not args.quiet:
+        print(f"Wrote {rows:,} rows to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""Month-by-month decumulation engine with cost-basis tracking.
+
+During retirement the balance earns withdrawal_return / 12 per month and a
+constant gross amount (the PMT payment that depletes it over the period)
+is withdrawn at the end of each month. Each withdrawal sells units; the
+gain it realizes is the sale amount minus the cost basis of the units
+sold, and that gain is taxed:
+
+    - "fifo": the oldest lots (lowest cost per unit after years of growth)
+      are sold first, so early withdrawals realize the most gain.
+    - "average": every unit carries the account's average cost.
+
+Either way the gains share of each withdrawal changes as the drawdown
+proceeds, unlike a static gains ratio.
+
+Units are priced at 1 at retirement and at (1 + r_m)^t in month t, so a
+lot's units equal its value at retirement and the cost of the first x
+units sold (FIFO) is a piecewise-linear function of x. All batch rows
+(starting ages, scenarios) are evaluated together: the per-row
+piecewise-linear cost functions are laid end to end on one axis and read
+with a single ``np.interp``.
+"""
+
+import numpy as np
+
+from .models import DecumulationResult
+
+
+DEFAULT_WITHDRAWAL_RETURN = 0.03  # Conservative return during the withdrawal phase
+COST_BASIS_METHODS = ("fifo", "average")
+
+
+def monthly_payment(
+    balance,
+    withdrawal_years,
+    annual_return=DEFAULT_WITHDRAWAL_RETURN,
+) -> np.ndarray:
+    """
+    Vectorized counterpart of ``calculate_monthly_withdrawal`` (PMT formula).
+
+    Args:
+        balance: Balance(s) at the start of withdrawals
+        withdrawal_years: Years to withdraw over
+        annual_return: Annual return(s) during withdrawal
+
+    Returns:
+        Monthly payment(s) that deplete the balance, 0 where the balance or
+        period is non-positive
+    """
+    balance = np.asarray(balance, dtype=float)
+    months = np.asarray(withdrawal_years, dtype=float) * 12
+    monthly_rate = np.asarray(annual_return, dtype=float) / 12
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        payment = np.where(
+            monthly_rate == 0,
+            balance / months,
+            balance * (monthly_rate / (1 - (1 + monthly_rate) ** -months)),
+        )
+    return np.where((balance > 0) & (months > 0), payment, 0.0)
+
+
+def simulate_decumulation(
+    lot_values,
+    lot_costs,
+    withdrawal_years: int,
+    annual_return=DEFAULT_WITHDRAWAL_RETURN,
+    tax_rate: float = 0.25,
+    cost_basis_method: str = "fifo",
+) -> DecumulationResult:
+    """
+    Simulate a monthly drawdown that taxes the gain realized by each withdrawal.
+
+    Lots are the account's holdings at retirement, oldest first. Losses are
+    not carried forward: a withdrawal that realizes a loss pays no tax.
+
+    Args:
+        lot_values: Value of each lot at retirement, shape (..., lots);
+            zero-value lots are allowed as padding
+        lot_costs: Cost basis of each lot, same shape as lot_values
+        withdrawal_years: Years to withdraw over
+        annual_return: Annual return(s) during withdrawal, broadcastable to
+            the batch shape (...)
+        tax_rate: Tax rate on realized gains
+        cost_basis_method: "fifo" or "average"
+
+    Returns:
+        DecumulationResult with batch shape (...)
+    """
+    if cost_basis_method not in COST_BASIS_METHODS:
+        raise ValueError(f"cost_basis_method must be one of {COST_BASIS_METHODS}")
+    if withdrawal_years <= 0:
+        raise ValueError("withdrawal_years must be positive")
+
+    lot_values = np.asarray(lot_values, dtype=float)
+    lot_costs = np.broadcast_to(np.asarray(lot_costs, dtype=float), lot_values.shape)
+    batch_shape = lot_values.shape[:-1]
+    n_lots = lot_values.shape[-1]
+    values = lot_values.reshape(-1, n_lots)
+    costs = lot_costs.reshape(-1, n_lots)
+    n_rows = values.shape[0]
+
+    months = np.arange(withdrawal_years * 12 + 1)
+    monthly_rate = np.broadcast_to(np.asarray(annual_return, dtype=float), batch_shape).reshape(-1) / 12
+
+    balance = values.sum(axis=1)
+    basis = costs.sum(axis=1)
+    payment = monthly_payment(balance, withdrawal_years, monthly_rate * 12)
+
+    # Axes: (row, month). Units sold to date; the last month sells the rest.
+    price = (1 + monthly_rate[:, None]) ** months[None, :]
+    units_sold = np.cumsum(payment[:, None] / price[:, 1:], axis=1)
+    units_sold = np.minimum(np.concatenate([np.zeros((n_rows, 1)), units_sold], axis=1), balance[:, None])
+
+    if cost_basis_method == "average":
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cost_per_unit = np.where(balance > 0, basis / balance, 0.0)
+        cost_sold = units_sold * cost_per_unit[:, None]
+    else:
+        # Per-row cumulative (units, cost) knots, shifted so rows occupy disjoint ranges
+        knot_units = np.concatenate([np.zeros((n_rows, 1)), np.cumsum(values, axis=1)], axis=1)
+        knot_costs = np.concatenate([np.zeros((n_rows, 1)), np.cumsum(costs, axis=1)], axis=1)
+        offsets = np.arange(n_rows)[:, None] * (balance.max(initial=0.0) + 1.0)
+        cost_sold = np.interp(
+            (units_sold + offsets).ravel(), (knot_units + offsets).ravel(), knot_costs.ravel()
+        ).reshape(units_sold.shape)
+
+    realized_gain = payment[:, None] - np.diff(cost_sold, axis=1)
+    tax = tax_rate * np.maximum(realized_gain, 0.0)
+
+    trajectory_shape = batch_shape + (len(months),)
+    flow_shape = batch_shape + (len(months) - 1,)
+    return DecumulationResult(
+        months=months,
+        balance=((balance[:, None] - units_sold) * price).reshape(trajectory_shape),
+        cost_basis=(basis[:, None] - cost_sold).reshape(trajectory_shape),
+        gross_monthly=payment.reshape(batch_shape),
+        realized_gain=realized_gain.reshape(flow_shape),
+        tax=tax.reshape(flow_shape),
+        cost_basis_method=cost_basis_method,
+    )
+
+
+def annual_deposit_lots(
+    annual_contribution: float,
+    net_return: float,
+    investment_years,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Lots left at retirement by end-of-year deposits, oldest first.
+
+    The deposit made m years before retirement is worth
+    annual_contribution * (1 + net_return)^m. Rows with shorter horizons
+    are left-padded with empty lots so every row has the same lot count.
+
+    Args:
+        annual_contribution: Amount deposited each year
+        net_return: Net annual return after fees
+        investment_years: Horizon(s) in whole years
+
+    Returns:
+        Tuple of (lot values, lot costs) with shape investment_years.shape + (lots,)
+    """
+    investment_years = np.asarray(investment_years, dtype=int)
+    n_lots = int(investment_years.max(initial=0))
+    years_to_retirement = np.arange(n_lots - 1, -1, -1)  # Oldest lot first
+    held = years_to_retirement < investment_years[..., None]
+
+    values = np.where(held, annual_contribution * (1 + net_return) ** years_to_retirement, 0.0)
+    costs = np.where(held, float(annual_contribution), 0.0)
+    return values, costs
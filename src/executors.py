@@ -0,0 +1,89 @@
+"""Pluggable execution backends for sweeps and batch runs.
+
+Sweep functions accept any ``concurrent.futures.Executor``. Work is split
+into contiguous chunks so pickling overhead stays small relative to the
+compute in each task, and results are always returned in input order, so
+output is identical whichever backend runs it.
+"""
+
+import math
+import os
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional, Sequence
+
+
+EXECUTOR_KINDS = ("serial", "thread", "process")
+CHUNKS_PER_WORKER = 4  # Chunks per worker when no chunk size is given
+
+
+class SerialExecutor(Executor):
+    """Executor that runs each task immediately in the calling thread."""
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as exc:
+            future.set_exception(exc)
+        return future
+
+
+def get_executor(
+    kind: str = "serial",
+    max_workers: Optional[int] = None,
+) -> Executor:
+    """
+    Create an executor by name.
+
+    Args:
+        kind: "serial", "thread" or "process"
+        max_workers: Number of workers for pools (defaults to the CPU count)
+
+    Returns:
+        A concurrent.futures Executor; use it as a context manager
+    """
+    if kind == "serial":
+        return SerialExecutor()
+    if kind == "thread":
+        return ThreadPoolExecutor(max_workers=max_workers)
+    if kind == "process":
+        return ProcessPoolExecutor(max_workers=max_workers)
+    raise ValueError(f"Unknown executor kind: {kind}")
+
+
+def chunk(items: Sequence, chunk_size: int) -> list[Sequence]:
+    """Split a sequence into contiguous chunks of at most chunk_size items."""
+    return [items[start:start + chunk_size] for start in range(0, len(items), chunk_size)]
+
+
+def map_chunks(
+    func: Callable[[Sequence], list],
+    items: Sequence,
+    executor: Optional[Executor] = None,
+    chunk_size: Optional[int] = None,
+) -> list:
+    """
+    Apply a chunk-level function over items and concatenate the results.
+
+    Args:
+        func: Picklable function taking a chunk of items and returning a list
+            with one result per item
+        items: Items to process
+        executor: Executor to run chunks on (serial if None)
+        chunk_size: Items per task (defaults to a few chunks per CPU)
+
+    Returns:
+        Results for every item, in input order
+    """
+    if not len(items):
+        return []
+    if executor is None or isinstance(executor, SerialExecutor):
+        return list(func(items))
+
+    if chunk_size is None:
+        chunk_size = math.ceil(len(items) / (CHUNKS_PER_WORKER * (os.cpu_count() or 1)))
+
+    results = []
+    for chunk_results in executor.map(func, chunk(items, max(1, chunk_size))):
+        results.extend(chunk_results)
+    return results
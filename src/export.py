@@ -0,0 +1,263 @@
+"""Export payloads for the Data Export section.
+
+Payloads are built on demand in CSV, Parquet or Excel, optionally
+compressed. Single tables are returned as bytes (and memoized by input in
+src.cache). Multi-scenario exports are written frame by frame into a
+spooled temporary file, which stays in memory while small and spills to
+disk once it grows, so a large export is never held as one string.
+
+Parquet requires pyarrow and Excel requires openpyxl; formats whose
+dependency is missing are left out of ``available_formats()``.
+"""
+
+import bz2
+import gzip
+import io
+import zipfile
+from contextlib import ExitStack
+from importlib.util import find_spec
+from tempfile import SpooledTemporaryFile
+from typing import BinaryIO, Iterable, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from .models import ProvidentInputs
+from .calculator import (
+    run_full_comparison,
+    generate_yearly_growth,
+    generate_comparison_dataframe,
+    generate_yearly_dataframe,
+    evaluate_sensitivity_grid,
+)
+
+
+SPOOL_MAX_SIZE = 32 * 1024 * 1024  # Bytes kept in memory before spilling to disk
+DOWNLOAD_MAX_SIZE = 200 * 1024 * 1024  # Largest payload handed to a UI download button
+
+# Format -> (file extension, MIME type, optional dependency)
+EXPORT_FORMATS = {
+    "csv": (".csv", "text/csv", None),
+    "parquet": (".parquet", "application/vnd.apache.parquet", "pyarrow"),
+    "excel": (".xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "openpyxl"),
+}
+
+# Compression codecs per format (None = uncompressed). Excel files are
+# zip containers already, so they take no extra codec.
+COMPRESSIONS = {
+    "csv": (None, "gzip", "zip", "bz2"),
+    "parquet": ("snappy", "zstd", "gzip", None),
+    "excel": (None,),
+}
+
+_CSV_SUFFIXES = {"gzip": (".gz", "application/gzip"), "zip": (".zip", "application/zip"),
+                 "bz2": (".bz2", "application/x-bzip2")}
+
+EXCEL_MAX_ROWS = 1_048_576  # Worksheet row limit, header included
+
+
+def available_formats() -> list[str]:
+    """Export formats whose optional dependency is installed."""
+    return [
+        fmt for fmt, (_, _, dependency) in EXPORT_FORMATS.items()
+        if dependency is None or find_spec(dependency) is not None
+    ]
+
+
+def _check_format(fmt: str, compression: Optional[str]) -> None:
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {list(EXPORT_FORMATS)}")
+    if compression not in COMPRESSIONS[fmt]:
+        raise ValueError(f"Compression {compression!r} is not supported for {fmt}")
+
+
+def export_filename(stem: str, fmt: str, compression: Optional[str] = None) -> str:
+    """File name for an export, e.g. ``comparison.csv.gz``."""
+    _check_format(fmt, compression)
+    name = stem + EXPORT_FORMATS[fmt][0]
+    if fmt == "csv" and compression is not None:
+        suffix = _CSV_SUFFIXES[compression][0]
+        name = stem + suffix if compression == "zip" else name + suffix
+    return name
+
+
+def export_mime(fmt: str, compression: Optional[str] = None) -> str:
+    """MIME type for an export."""
+    _check_format(fmt, compression)
+    if fmt == "csv" and compression is not None:
+        return _CSV_SUFFIXES[compression][1]
+    return EXPORT_FORMATS[fmt][1]
+
+
+def write_frames(
+    frames: Iterable[pd.DataFrame],
+    fileobj: BinaryIO,
+    fmt: str = "csv",
+    compression: Optional[str] = None,
+    name: str = "data",
+) -> int:
+    """
+    Write DataFrames with identical columns to a binary file object.
+
+    Frames are written one at a time, so the whole table never has to be
+    materialized.
+
+    Args:
+        frames: DataFrames to write, in order
+        fileobj: Writable binary file object
+        fmt: "csv", "parquet" or "excel"
+        compression: Codec from COMPRESSIONS[fmt]
+        name: Member name inside a zip archive, or the Excel sheet name
+
+    Returns:
+        Number of data rows written
+    """
+    _check_format(fmt, compression)
+    rows = 0
+
+    with ExitStack() as stack:
+        if fmt == "csv":
+            if compression == "gzip":
+                raw = stack.enter_context(gzip.GzipFile(fileobj=fileobj, mode="wb"))
+            elif compression == "bz2":
+                raw = stack.enter_context(bz2.BZ2File(fileobj, mode="wb"))
+            elif compression == "zip":
+                archive = stack.enter_context(zipfile.ZipFile(fileobj, "w", zipfile.ZIP_DEFLATED))
+                raw = stack.enter_context(archive.open(f"{name}.csv", "w", force_zip64=True))
+            else:
+                raw = fileobj
+            text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+            for frame in frames:
+                frame.to_csv(text, header=rows == 0, index=False)
+                rows += len(frame)
+            text.flush()
+            text.detach()
+
+        elif fmt == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            writer = None
+            for frame in frames:
+                table = pa.Table.from_pandas(frame, preserve_index=False)
+                if writer is None:
+                    writer = stack.enter_context(
+                        pq.ParquetWriter(fileobj, table.schema, compression=compression or "none")
+                    )
+                writer.write_table(table)
+                rows += len(frame)
+
+        else:
+            writer = stack.enter_context(pd.ExcelWriter(fileobj, engine="openpyxl"))
+            for frame in frames:
+                if rows + len(frame) >= EXCEL_MAX_ROWS:
+                    raise ValueError("Export exceeds the Excel row limit; use CSV or Parquet")
+                frame.to_excel(writer, sheet_name=name, index=False,
+                               header=rows == 0, startrow=0 if rows == 0 else rows + 1)
+                rows += len(frame)
+
+    return rows
+
+
+def frame_to_bytes(
+    frame: pd.DataFrame,
+    fmt: str = "csv",
+    compression: Optional[str] = None,
+    name: str = "data",
+) -> bytes:
+    """Serialize a single DataFrame in the given format."""
+    buffer = io.BytesIO()
+    write_frames([frame], buffer, fmt, compression, name)
+    return buffer.getvalue()
+
+
+def stream_frames(
+    frames: Iterable[pd.DataFrame],
+    fmt: str = "csv",
+    compression: Optional[str] = None,
+    name: str = "data",
+) -> SpooledTemporaryFile:
+    """
+    Write frames into a spooled temporary file, rewound for reading.
+
+    Args:
+        frames: DataFrames to write, in order
+        fmt: "csv", "parquet" or "excel"
+        compression: Codec from COMPRESSIONS[fmt]
+        name: Member name inside a zip archive, or the Excel sheet name
+
+    Returns:
+        Binary file object positioned at the start of the export
+    """
+    spool = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE, mode="w+b")
+    write_frames(frames, spool, fmt, compression, name)
+    spool.seek(0)
+    return spool
+
+
+def comparison_export(
+    inputs: ProvidentInputs,
+    fmt: str = "csv",
+    compression: Optional[str] = None,
+) -> bytes:
+    """Age comparison table for the given inputs, serialized."""
+    summary = run_full_comparison(inputs)
+    return frame_to_bytes(generate_comparison_dataframe(summary), fmt, compression, "comparison")
+
+
+def yearly_growth_export(
+    inputs: ProvidentInputs,
+    fmt: str = "csv",
+    compression: Optional[str] = None,
+) -> bytes:
+    """Year-by-year growth table for the given inputs, serialized."""
+    yearly_df = generate_yearly_dataframe(generate_yearly_growth(inputs))
+    return frame_to_bytes(yearly_df, fmt, compression, "yearly_growth")
+
+
+def sensitivity_scenario_frames(
+    inputs: ProvidentInputs,
+    return_rates: list[float] = None,
+    inflation_rates: list[float] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Long-format net values for every sensitivity scenario.
+
+    Yields one frame per expected-return row of the sensitivity grid, with
+    one row per (inflation rate, starting age).
+
+    Args:
+        inputs: Base input parameters
+        return_rates: Return rates to test (calculator defaults if None)
+        inflation_rates: Inflation rates to test (calculator defaults if None)
+
+    Yields:
+        DataFrame per return rate
+    """
+    grid = evaluate_sensitivity_grid(inputs, return_rates, inflation_rates)
+    inflation_column = np.repeat(grid.inflation_rates, len(grid.starting_ages))
+    age_column = np.tile(grid.starting_ages, len(grid.inflation_rates))
+
+    for i, return_rate in enumerate(grid.return_rates):
+        provident = grid.provident_net[i].ravel()
+        personal = grid.personal_net[i].ravel()
+        yield pd.DataFrame({
+            "Expected Return": np.full(len(provident), return_rate),
+            "Inflation Rate": inflation_column,
+            "Starting Age": age_column,
+            "Provident Net": provident,
+            "Personal Net": personal,
+            "Difference": provident - personal,
+        })
+
+
+def sensitivity_export(
+    inputs: ProvidentInputs,
+    fmt: str = "csv",
+    compression: Optional[str] = None,
+    return_rates: list[float] = None,
+    inflation_rates: list[float] = None,
+) -> SpooledTemporaryFile:
+    """All sensitivity scenarios, streamed into a spooled temporary file."""
+    frames = sensitivity_scenario_frames(inputs, return_rates, inflation_rates)
+    return stream_frames(frames, fmt, compression, "scenarios")
@@ -0,0 +1,272 @@
+"""Dependency-tracked computation graph over the calculator stages.
+
+Each stage declares the ProvidentInputs fields it reads and the stages it
+consumes. When the inputs change, only stages that read a changed field,
+or sit downstream of one, are invalidated; everything else keeps its
+value. Stages are evaluated lazily, so a stage nobody asks for (e.g., the
+sensitivity grid while its view is closed) is never computed.
+
+The comparison graph mirrors the calculator pipeline:
+
+    horizons ─> accumulation ─┬─> taxes ─> summaries
+                              └─> withdrawal
+    yearly_growth, growth_matrix, tax_comparison, sensitivity (independent stages)
+
+Moving the life-expectancy slider, for example, invalidates only the
+withdrawal stage and the summaries that carry the inputs.
+
+A stage's value depends only on the fields it and its upstream stages
+read, so computed values are also kept in a module-level LRU keyed on
+those fields (through ``cache.memoize``). A graph that misses its own
+values, e.g., in another Streamlit session with the same inputs, reuses
+them from there without recomputing or even evaluating dependencies;
+``cache.clear_caches()`` clears it with the calculator caches.
+"""
+
+from collections import Counter
+from dataclasses import dataclass, fields, replace
+from typing import Any, Callable, Iterable, Optional
+
+import numpy as np
+
+from . import cache
+from .models import ProvidentInputs
+from .calculator import (
+    accumulate_inputs,
+    apply_taxes,
+    build_summary,
+    calculate_growth_matrix,
+    calculate_withdrawal_from_balances,
+    is_annuity_exempt,
+)
+
+
+ALL_FIELDS = tuple(f.name for f in fields(ProvidentInputs))
+WITHDRAWAL_MODES = ("annuity", "lump_sum")
+SHARED_CACHE_SIZE = 256  # Stage values shared across graphs before LRU eviction
+
+
+@cache.memoize(SHARED_CACHE_SIZE)
+def _shared_slot(key: tuple) -> dict:
+    """Holder for one stage value, shared by every graph computing the same key."""
+    return {}
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One node of the computation graph."""
+
+    name: str  # Unique stage name
+    func: Callable[..., Any]  # Called as func(inputs, *dependency values)
+    fields: tuple[str, ...] = ()  # ProvidentInputs fields the stage reads directly
+    depends_on: tuple[str, ...] = ()  # Upstream stages, in func argument order
+
+
+class ComputationGraph:
+    """Lazily evaluated stages with field-level invalidation."""
+
+    def __init__(self, stages: Iterable[Stage]):
+        self.stages: dict[str, Stage] = {}
+        for stage in stages:
+            unknown = [dep for dep in stage.depends_on if dep not in self.stages]
+            if unknown:
+                raise ValueError(
+                    f"Stage {stage.name!r} depends on undefined stages {unknown}; "
+                    "declare stages after their dependencies"
+                )
+            bad_fields = set(stage.fields) - set(ALL_FIELDS)
+            if bad_fields:
+                raise ValueError(f"Stage {stage.name!r} reads unknown fields {sorted(bad_fields)}")
+            self.stages[stage.name] = stage
+
+        # Every field a stage's value depends on, directly or through its dependencies
+        self.key_fields: dict[str, tuple[str, ...]] = {}
+        for stage in self.stages.values():
+            used = set(stage.fields).union(*(self.key_fields[dep] for dep in stage.depends_on))
+            self.key_fields[stage.name] = tuple(name for name in ALL_FIELDS if name in used)
+
+        self.inputs: Optional[ProvidentInputs] = None
+        self.compute_counts: Counter = Counter()  # Evaluations by this graph, for diagnostics
+        self._values: dict[str, Any] = {}
+
+    def invalidated_by(self, changed_fields: Iterable[str]) -> set[str]:
+        """Stages that read any of the fields, plus everything downstream of them."""
+        changed_fields = set(changed_fields)
+        dirty: set[str] = set()
+        # Stages are stored in dependency order, so one pass suffices
+        for stage in self.stages.values():
+            if changed_fields.intersection(stage.fields) or dirty.intersection(stage.depends_on):
+                dirty.add(stage.name)
+        return dirty
+
+    def update(self, inputs: ProvidentInputs) -> set[str]:
+        """
+        Switch to new inputs, dropping only the affected stage values.
+
+        Args:
+            inputs: New input parameters
+
+        Returns:
+            Names of the invalidated stages
+        """
+        if self.inputs is None:
+            changed = set(ALL_FIELDS)
+        else:
+            changed = {
+                name for name in ALL_FIELDS
+                if getattr(inputs, name) != getattr(self.inputs, name)
+            }
+
+        dirty = self.invalidated_by(changed)
+        for name in dirty:
+            self._values.pop(name, None)
+        self.inputs = inputs
+        return dirty
+
+    def get(self, name: str) -> Any:
+        """Value of a stage, computing it (and any stale dependencies) if needed."""
+        if self.inputs is None:
+            raise RuntimeError("Call update() with inputs before reading stages")
+        if name not in self._values:
+            stage = self.stages[name]
+            key = (stage.func, name, tuple(getattr(self.inputs, field) for field in self.key_fields[name]))
+            slot = _shared_slot(key)
+            if "value" not in slot:
+                dependencies = [self.get(dep) for dep in stage.depends_on]
+                slot["value"] = stage.func(self.inputs, *dependencies)
+                self.compute_counts[name] += 1
+            self._values[name] = slot["value"]
+        return self._values[name]
+
+    def is_fresh(self, name: str) -> bool:
+        """Whether a stage currently holds a valid value."""
+        return name in self._values
+
+
+def _horizons(inputs: ProvidentInputs, min_age: int = 18, max_age: int = 59) -> dict[str, np.ndarray]:
+    starting_ages = np.arange(min_age, max_age + 1)
+    return {
+        "starting_age": starting_ages,
+        "investment_years": np.maximum(inputs.retirement_age - starting_ages, 0),
+    }
+
+
+def _accumulation(inputs: ProvidentInputs, horizons: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    return accumulate_inputs(inputs, horizons["investment_years"])
+
+
+def _taxes(
+    inputs: ProvidentInputs,
+    horizons: dict[str, np.ndarray],
+    accumulation: dict[str, np.ndarray],
+) -> dict[str, dict[str, np.ndarray]]:
+    return {
+        mode: {
+            **horizons,
+            **apply_taxes(
+                accumulation,
+                capital_gains_tax=inputs.capital_gains_tax,
+                annuity_exempt=is_annuity_exempt(mode, inputs.retirement_age),
+            ),
+        }
+        for mode in WITHDRAWAL_MODES
+    }
+
+
+def _summaries(inputs: ProvidentInputs, taxes: dict[str, dict[str, np.ndarray]]) -> dict:
+    return {
+        mode: build_summary(replace(inputs, withdrawal_mode=mode), arrays)
+        for mode, arrays in taxes.items()
+    }
+
+
+def _withdrawal(
+    inputs: ProvidentInputs,
+    horizons: dict[str, np.ndarray],
+    accumulation: dict[str, np.ndarray],
+):
+    index = inputs.current_age - int(horizons["starting_age"][0])
+    if 0 <= index < len(horizons["starting_age"]):
+        balances = {key: float(values[index]) for key, values in accumulation.items()}
+    else:
+        balances = {
+            key: float(values)
+            for key, values in accumulate_inputs(inputs, inputs.get_investment_years()).items()
+        }
+
+    # Same contribution for both accounts (apples-to-apples comparison)
+    return calculate_withdrawal_from_balances(
+        provident_balance=balances["provident_gross"],
+        provident_contributions=balances["contributions"],
+        personal_balance=balances["personal_gross"],
+        personal_contributions=balances["contributions"],
+        inputs=inputs,
+    )
+
+
+RATE_FIELDS = (
+    "provident_expected_return",
+    "provident_mgmt_fee",
+    "personal_expected_return",
+    "personal_mgmt_fee",
+)
+
+
+def build_comparison_graph() -> ComputationGraph:
+    """
+    Build the graph of stages behind the comparison app.
+
+    Stage values:
+        horizons: Starting ages (18-59) and investment years
+        accumulation: Gross balances, contributions and inflation basis per starting age
+        taxes: Per-age comparison arrays for each withdrawal mode
+        summaries: ComparisonSummary for each withdrawal mode
+        withdrawal: MonthlyWithdrawalResult at the current age
+        yearly_growth: Year-by-year growth from the current age
+        growth_matrix: Growth trajectories for every starting age
+        tax_comparison: Tax breakdown at the current age
+        sensitivity: SensitivityGrid over the default rate grids
+
+    Returns:
+        ComputationGraph ready for ``update(inputs)``
+    """
+    return ComputationGraph([
+        Stage("horizons", _horizons, fields=("retirement_age",)),
+        Stage(
+            "accumulation", _accumulation,
+            fields=("annual_contribution", "inflation_rate") + RATE_FIELDS,
+            depends_on=("horizons",),
+        ),
+        Stage(
+            "taxes", _taxes,
+            fields=("capital_gains_tax", "retirement_age"),
+            depends_on=("horizons", "accumulation"),
+        ),
+        # Summaries carry the inputs themselves, so any change rebuilds them (cheap)
+        Stage("summaries", _summaries, fields=ALL_FIELDS, depends_on=("taxes",)),
+        Stage(
+            "withdrawal", _withdrawal,
+            fields=("current_age", "life_expectancy", "retirement_age", "capital_gains_tax"),
+            depends_on=("horizons", "accumulation"),
+        ),
+        Stage(
+            "yearly_growth", cache.generate_yearly_growth,
+            fields=("current_age", "retirement_age", "annual_contribution") + RATE_FIELDS,
+        ),
+        Stage(
+            "growth_matrix", calculate_growth_matrix,
+            fields=("retirement_age", "annual_contribution") + RATE_FIELDS,
+        ),
+        Stage(
+            "tax_comparison", cache.calculate_tax_comparison,
+            fields=tuple(name for name in ALL_FIELDS if name not in ("life_expectancy", "annual_cap")),
+        ),
+        # The grid overrides expected returns and inflation, so it ignores those sliders
+        Stage(
+            "sensitivity", cache.evaluate_sensitivity_grid,
+            fields=(
+                "retirement_age", "annual_contribution", "provident_mgmt_fee",
+                "personal_mgmt_fee", "capital_gains_tax", "withdrawal_mode",
+            ),
+        ),
+    ])
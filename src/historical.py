@@ -0,0 +1,205 @@
+"""Historical replay of index returns and inflation through the accumulation engine.
+
+Instead of constant expected returns, both accounts earn the actual index
+return of each historical period (net of their own fees), and the
+Provident real-gains basis is indexed to the actual CPI. Every rolling
+window of the history is replayed: window w retires at its last period
+and each starting age begins as many periods earlier as its horizon
+needs.
+
+Deposits of annual_contribution / periods_per_year are made at the end
+of every period, so annual data reproduces the annual engine's
+end-of-year deposits. No window is looped over in Python: with P the
+cumulative growth product, the balance of deposits d made at the ends of
+periods s..T is d * P[T] * (S[T] - S[s - 1]) where S = cumsum(1 / P), so
+every (window x age) balance is a pair of gathers from two cumulative
+arrays.
+
+The history file is supplied by the user; see ``load_market_history``
+for the expected columns.
+"""
+
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .models import ProvidentInputs, MarketHistory, BacktestResult
+from .calculator import apply_taxes, is_annuity_exempt
+
+
+RETURN_COLUMNS = ("index_return", "index_level")
+INFLATION_COLUMNS = ("inflation", "cpi")
+
+
+def _infer_periods_per_year(dates: pd.Series) -> int:
+    """Infer 12 (monthly) or 1 (annual) from the date column."""
+    if pd.api.types.is_integer_dtype(dates):
+        return 1  # Plain years
+    spacing = pd.to_datetime(dates).diff().dt.days.median()
+    if 25 <= spacing <= 35:
+        return 12
+    if 350 <= spacing <= 380:
+        return 1
+    raise ValueError(f"Cannot infer frequency from a median spacing of {spacing} days")
+
+
+def load_market_history(
+    path: Union[str, Path],
+    periods_per_year: Optional[int] = None,
+) -> MarketHistory:
+    """
+    Load index returns and inflation from a CSV or Parquet file.
+
+    The file has a ``date`` column (dates, or integer years for annual
+    data), oldest first, plus:
+        - ``index_return`` (total return per period) or ``index_level``
+          (total-return index level), and
+        - ``inflation`` (CPI change per period) or ``cpi`` (CPI level).
+    Level columns are converted to per-period changes, dropping the first row.
+
+    Args:
+        path: CSV or Parquet file (Parquet requires pyarrow)
+        periods_per_year: 12 or 1; inferred from the dates if None
+
+    Returns:
+        MarketHistory with aligned returns and inflation
+    """
+    path = Path(path)
+    frame = pd.read_parquet(path) if path.suffix.lower() == ".parquet" else pd.read_csv(path)
+
+    if "date" not in frame.columns:
+        raise ValueError("History file needs a 'date' column")
+    return_column = next((c for c in RETURN_COLUMNS if c in frame.columns), None)
+    inflation_column = next((c for c in INFLATION_COLUMNS if c in frame.columns), None)
+    if return_column is None or inflation_column is None:
+        raise ValueError(
+            f"History file needs one of {RETURN_COLUMNS} and one of {INFLATION_COLUMNS}"
+        )
+
+    frame = frame.sort_values("date", kind="stable").reset_index(drop=True)
+    returns = frame[return_column].astype(float)
+    inflation = frame[inflation_column].astype(float)
+    if return_column == "index_level":
+        returns = returns.pct_change()
+    if inflation_column == "cpi":
+        inflation = inflation.pct_change()
+
+    # Level columns lose their first row to the differencing
+    valid = returns.notna() & inflation.notna()
+    if not valid.all() and valid.iloc[1:].all():
+        frame, returns, inflation = frame.iloc[1:], returns.iloc[1:], inflation.iloc[1:]
+    elif not valid.all():
+        raise ValueError("History file has missing values")
+
+    return MarketHistory(
+        dates=frame["date"].to_numpy(),
+        returns=returns.to_numpy(),
+        inflation=inflation.to_numpy(),
+        periods_per_year=periods_per_year or _infer_periods_per_year(frame["date"]),
+    )
+
+
+def _window_sums(growth: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    Sum over j in [start, end] of prod(growth[j + 1 .. end]), for many windows at once.
+
+    This is the value at period ``end`` of a unit deposit at the end of
+    every period from ``start`` to ``end``. Products are accumulated in log
+    space and measured relative to the end of the history.
+
+    Args:
+        growth: Per-period growth factors (1 + rate), shape (periods,)
+        starts: First deposit period, any shape
+        ends: Last period (valuation point), broadcastable to starts
+
+    Returns:
+        Array of compounded deposit sums with the broadcast shape
+    """
+    log_level = np.concatenate(([0.0], np.cumsum(np.log(growth))))  # log P, P[-1] = 1
+    # S[k] = sum_{j < k} 1 / P[j], measured relative to P at the end of the history
+    inverse_level = np.exp(-(log_level[1:] - log_level[-1]))
+    cumulative = np.concatenate(([0.0], np.cumsum(inverse_level)))
+    scale = np.exp(log_level[ends + 1] - log_level[-1])
+    return scale * (cumulative[ends + 1] - cumulative[starts])
+
+
+def run_rolling_backtest(
+    inputs: ProvidentInputs,
+    history: MarketHistory,
+    min_age: int = 18,
+    max_age: int = 59,
+) -> BacktestResult:
+    """
+    Replay every rolling historical window for every starting age.
+
+    Both accounts hold the same index; they differ in fees and taxation.
+    Fees are charged per period so that a year compounds to the annual
+    fee, and the Provident real-gains basis indexes each deposit by the
+    actual CPI change up to retirement.
+
+    Args:
+        inputs: All input parameters (expected returns and inflation are unused)
+        history: Historical returns and inflation
+        min_age: Minimum starting age to analyze
+        max_age: Maximum starting age to analyze
+
+    Returns:
+        BacktestResult with per-window net values and crossover ages
+    """
+    periods_per_year = history.periods_per_year
+    starting_ages = np.arange(min_age, max_age + 1)
+    investment_years = np.maximum(inputs.retirement_age - starting_ages, 0)
+    horizon_periods = investment_years * periods_per_year
+    window_length = int(horizon_periods.max(initial=0))
+
+    n_windows = len(history) - window_length + 1
+    if window_length == 0 or n_windows < 1:
+        raise ValueError(
+            f"History covers {history.years:.1f} years; "
+            f"the longest horizon needs {window_length / periods_per_year:.0f}"
+        )
+
+    # Axes: (window, starting age); each age deposits from `starts` to the window end
+    window_starts = np.arange(n_windows)
+    ends = (window_starts + window_length - 1)[:, None]
+    starts = ends - horizon_periods[None, :] + 1
+
+    deposit = inputs.annual_contribution / periods_per_year
+    returns = np.asarray(history.returns, dtype=float)
+
+    def balances(annual_fee: float) -> np.ndarray:
+        growth = (1 + returns) * (1 - annual_fee) ** (1 / periods_per_year)
+        return np.where(horizon_periods > 0, deposit * _window_sums(growth, starts, ends), 0.0)
+
+    inflation_adjusted = np.where(
+        horizon_periods > 0,
+        deposit * _window_sums(1 + np.asarray(history.inflation, dtype=float), starts, ends),
+        0.0,
+    )
+
+    values = apply_taxes(
+        {
+            "provident_gross": balances(inputs.provident_mgmt_fee),
+            "personal_gross": balances(inputs.personal_mgmt_fee),
+            "contributions": inputs.annual_contribution * investment_years.astype(float),
+            "provident_inflation_adjusted": inflation_adjusted,
+        },
+        capital_gains_tax=inputs.capital_gains_tax,
+        annuity_exempt=is_annuity_exempt(inputs.withdrawal_mode, inputs.retirement_age),
+    )
+
+    wins = values["provident_net"] > values["personal_net"]
+    crossover_ages = np.where(
+        wins.any(axis=1), starting_ages[wins.argmax(axis=1)].astype(float), np.nan
+    )
+
+    return BacktestResult(
+        window_starts=np.asarray(history.dates)[window_starts],
+        window_ends=np.asarray(history.dates)[window_starts + window_length - 1],
+        starting_ages=starting_ages,
+        provident_net=values["provident_net"],
+        personal_net=values["personal_net"],
+        crossover_ages=crossover_ages,
+    )
@@ -1,12 +1,19 @@
 """Data models for Provident Fund vs Personal Investment comparison."""
 
-from dataclasses import dataclass
-from typing import Optional
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Optional, Union
 
+import numpy as np
 
-@dataclass
+
+@dataclass(frozen=True)
 class ProvidentInputs:
-    """Input parameters for the investment comparison."""
+    """Input parameters for the investment comparison.
+
+    Frozen so that inputs are hashable and can key the calculator caches.
+    Use ``dataclasses.replace`` to derive modified inputs.
+    """
 
     current_age: int  # Current age of the investor
     retirement_age: int  # Target withdrawal age (typically 60 for annuity benefit)
@@ -132,23 +139,187 @@ class AgeComparisonResult:
         return self.difference > 0
 
 
+class AgeResultsTable(Sequence):
+    """Columnar (struct-of-arrays) store of per-age comparison results.
+
+    Each AgeComparisonResult field is held as one NumPy array. Indexing or
+    iterating yields AgeComparisonResult views built on demand, so code that
+    treats ``age_results`` as a list keeps working.
+    """
+
+    COLUMNS = (
+        "starting_age",
+        "investment_years",
+        "provident_gross",
+        "provident_contributions",
+        "provident_tax",
+        "provident_net",
+        "personal_gross",
+        "personal_contributions",
+        "personal_tax",
+        "personal_net",
+    )
+
+    def __init__(
+        self,
+        columns: dict[str, np.ndarray],
+        retirement_age: int,
+        withdrawal_mode: str,
+    ):
+        self.columns = {name: np.asarray(columns[name]) for name in self.COLUMNS}
+        self.retirement_age = retirement_age
+        self.withdrawal_mode = withdrawal_mode
+
+    def __len__(self) -> int:
+        return len(self.columns["starting_age"])
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return AgeResultsTable(
+                {name: values[index] for name, values in self.columns.items()},
+                self.retirement_age,
+                self.withdrawal_mode,
+            )
+        row = {name: values[index].item() for name, values in self.columns.items()}
+        return AgeComparisonResult(
+            retirement_age=self.retirement_age,
+            withdrawal_mode=self.withdrawal_mode,
+            **row,
+        )
+
+    def __iter__(self):
+        for row in zip(*(values.tolist() for values in self.columns.values())):
+            yield AgeComparisonResult(
+                retirement_age=self.retirement_age,
+                withdrawal_mode=self.withdrawal_mode,
+                **dict(zip(self.COLUMNS, row)),
+            )
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, AgeResultsTable):
+            return NotImplemented
+        return (
+            self.retirement_age == other.retirement_age
+            and self.withdrawal_mode == other.withdrawal_mode
+            and all(
+                np.array_equal(values, other.columns[name])
+                for name, values in self.columns.items()
+            )
+        )
+
+    def __repr__(self) -> str:
+        return f"AgeResultsTable({len(self)} ages, withdrawal_mode={self.withdrawal_mode!r})"
+
+    def column(self, name: str) -> np.ndarray:
+        """Get one column as a NumPy array (no copy)."""
+        return self.columns[name]
+
+    @property
+    def difference(self) -> np.ndarray:
+        """Net difference (provident - personal) for every age."""
+        return self.columns["provident_net"] - self.columns["personal_net"]
+
+    def index_of(self, starting_age: int) -> Optional[int]:
+        """Row index for a starting age in O(1), or None if absent."""
+        ages = self.columns["starting_age"]
+        if not len(ages):
+            return None
+        # Ages are contiguous and ascending, so the row is an offset
+        index = starting_age - int(ages[0])
+        if 0 <= index < len(ages) and ages[index] == starting_age:
+            return index
+        return None
+
+    def get(self, starting_age: int) -> Optional[AgeComparisonResult]:
+        """Result for a starting age, or None if it was not analyzed."""
+        index = self.index_of(starting_age)
+        return None if index is None else self[index]
+
+    def to_pandas(self):
+        """Convert to a pandas DataFrame, one column per field, without copying."""
+        import pandas as pd
+
+        return pd.DataFrame(self.columns, copy=False)
+
+    def to_arrow(self):
+        """Convert to a pyarrow Table (requires pyarrow)."""
+        import pyarrow as pa
+
+        return pa.table(self.columns)
+
+
+class YearlyGrowthTable(Sequence):
+    """Columnar store of year-by-year growth, one NumPy array per column.
+
+    Indexing or iterating yields YearlyResult views built on demand, so
+    code that treats yearly growth as a list keeps working.
+    """
+
+    COLUMNS = (
+        "year",
+        "age",
+        "provident_fv",
+        "provident_contributions",
+        "personal_fv",
+        "personal_contributions",
+    )
+
+    def __init__(self, columns: dict[str, np.ndarray]):
+        self.columns = {name: np.asarray(columns[name]) for name in self.COLUMNS}
+
+    def __len__(self) -> int:
+        return len(self.columns["year"])
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return YearlyGrowthTable({name: values[index] for name, values in self.columns.items()})
+        return YearlyResult(**{name: values[index].item() for name, values in self.columns.items()})
+
+    def __iter__(self):
+        for row in zip(*(values.tolist() for values in self.columns.values())):
+            yield YearlyResult(**dict(zip(self.COLUMNS, row)))
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, YearlyGrowthTable):
+            return NotImplemented
+        return all(
+            np.array_equal(values, other.columns[name])
+            for name, values in self.columns.items()
+        )
+
+    def __repr__(self) -> str:
+        return f"YearlyGrowthTable({len(self)} years)"
+
+    def column(self, name: str) -> np.ndarray:
+        """Get one column as a NumPy array (no copy)."""
+        return self.columns[name]
+
+    @property
+    def provident_gain(self) -> np.ndarray:
+        """Nominal gain in Provident Fund for every year."""
+        return self.columns["provident_fv"] - self.columns["provident_contributions"]
+
+    @property
+    def personal_gain(self) -> np.ndarray:
+        """Nominal gain in personal account for every year."""
+        return self.columns["personal_fv"] - self.columns["personal_contributions"]
+
+
 @dataclass
 class ComparisonSummary:
     """Summary of the full comparison across all ages."""
 
     inputs: ProvidentInputs
-    age_results: list[AgeComparisonResult]  # Results for each starting age
+    age_results: AgeResultsTable  # Results for each starting age
     crossover_age: Optional[int]  # Age where Provident becomes better (None if never)
     provident_net_return: float  # Calculated net return for Provident Fund
     personal_net_return: float  # Calculated net return for personal account
+    crossover_ages: list[int] = field(default_factory=list)  # Every age where the winner flips
 
     @property
     def current_age_result(self) -> Optional[AgeComparisonResult]:
         """Get the result for the user's current age."""
-        for result in self.age_results:
-            if result.starting_age == self.inputs.current_age:
-                return result
-        return None
+        return self.age_results.get(self.inputs.current_age)
 
     @property
     def winner_at_current_age(self) -> str:
@@ -163,6 +334,20 @@ class ComparisonSummary:
         """Whether there is a crossover point."""
         return self.crossover_age is not None
 
+    @property
+    def is_monotonic(self) -> bool:
+        """Whether the winner flips at most once across starting ages."""
+        return len(self.crossover_ages) <= 1
+
+
+@dataclass
+class CrossoverSolution:
+    """Integer and continuous crossover from the root-finding solver."""
+
+    crossover_age: Optional[int]  # First whole starting age where Provident wins
+    continuous_age: Optional[float]  # Fractional starting age where both nets are equal
+    continuous_years: Optional[float]  # Investment horizon at the continuous crossover
+
 
 @dataclass
 class SensitivityPoint:
@@ -174,6 +359,68 @@ class SensitivityPoint:
     provident_advantage_at_30: float  # Difference if starting at age 30
 
 
+@dataclass
+class SensitivityGrid:
+    """Net values over a (return x inflation x starting-age) grid."""
+
+    return_rates: np.ndarray  # Return rate for each row
+    inflation_rates: np.ndarray  # Inflation rate for each column
+    starting_ages: np.ndarray  # Starting age for each slice along the last axis
+    provident_net: np.ndarray  # Provident net at retirement, shape (returns, inflations, ages)
+    personal_net: np.ndarray  # Personal net at retirement, same shape
+
+    @property
+    def difference(self) -> np.ndarray:
+        """Net difference (provident - personal). Positive = Provident wins."""
+        return self.provident_net - self.personal_net
+
+    def crossover_age_matrix(self) -> np.ndarray:
+        """First starting age where Provident wins per cell (NaN if never)."""
+        wins = self.difference > 0
+        first_win = self.starting_ages[wins.argmax(axis=-1)].astype(float)
+        return np.where(wins.any(axis=-1), first_win, np.nan)
+
+    def advantage_at(self, starting_age: int) -> np.ndarray:
+        """Net difference per cell for a given starting age."""
+        index = starting_age - int(self.starting_ages[0])
+        if not 0 <= index < len(self.starting_ages):
+            raise ValueError(f"Starting age {starting_age} is outside the grid")
+        return self.difference[..., index]
+
+
+@dataclass
+class DecumulationResult:
+    """Month-by-month drawdown trajectories from the decumulation engine."""
+
+    months: np.ndarray  # Month number (0 = retirement)
+    balance: np.ndarray  # Balance after each month, shape (..., months + 1)
+    cost_basis: np.ndarray  # Remaining cost basis after each month, shape (..., months + 1)
+    gross_monthly: np.ndarray  # Gross withdrawal per month (constant), shape (...)
+    realized_gain: np.ndarray  # Gain realized by each withdrawal, shape (..., months)
+    tax: np.ndarray  # Tax paid on each withdrawal, shape (..., months)
+    cost_basis_method: str = "fifo"  # "fifo" or "average"
+
+    @property
+    def net_monthly(self) -> np.ndarray:
+        """Net withdrawal each month."""
+        return self.gross_monthly[..., None] - self.tax
+
+    @property
+    def total_tax(self) -> np.ndarray:
+        """Tax paid over the whole withdrawal period."""
+        return self.tax.sum(axis=-1)
+
+    @property
+    def mean_tax_monthly(self) -> np.ndarray:
+        """Average tax per month over the withdrawal period."""
+        return self.tax.mean(axis=-1)
+
+    @property
+    def mean_realized_gain_monthly(self) -> np.ndarray:
+        """Average realized gain per month over the withdrawal period."""
+        return self.realized_gain.mean(axis=-1)
+
+
 @dataclass
 class MonthlyWithdrawalResult:
     """Results for monthly withdrawal (קצבה) comparison."""
@@ -188,12 +435,14 @@ class MonthlyWithdrawalResult:
     personal_balance: float  # Total balance at retirement
     personal_contributions: float  # Total contributions
     personal_gross_monthly: float  # Monthly withdrawal before tax
-    personal_net_monthly: float  # Net monthly withdrawal after tax on gains
-    personal_tax_per_month: float  # Tax paid per month
+    personal_net_monthly: float  # Average net monthly withdrawal after tax on gains
+    personal_tax_per_month: float  # Average tax paid per month
     
     # Comparison
     withdrawal_years: int  # Number of years in retirement
     withdrawal_return: float  # Expected return during withdrawal period
+    personal_drawdown: Optional[DecumulationResult] = None  # Month-by-month personal drawdown
+    provident_drawdown: Optional[DecumulationResult] = None  # Month-by-month Provident drawdown
 
     @property
     def monthly_difference(self) -> float:
@@ -218,3 +467,241 @@ class MonthlyWithdrawalResult:
     def lifetime_tax_savings(self) -> float:
         """Total tax saved over retirement by using provident fund annuity."""
         return self.personal_tax_per_month * 12 * self.withdrawal_years
+
+
+@dataclass
+class MonteCarloResult:
+    """Distribution of outcomes from a Monte Carlo simulation across starting ages."""
+
+    starting_ages: np.ndarray  # Starting ages analyzed
+    percentiles: np.ndarray  # Percentiles reported in the bands (e.g., 5, 50, 95)
+    provident_net_bands: np.ndarray  # Provident net percentiles, shape (percentiles, ages)
+    personal_net_bands: np.ndarray  # Personal net percentiles, shape (percentiles, ages)
+    difference_bands: np.ndarray  # Difference percentiles, shape (percentiles, ages)
+    provident_win_probability: np.ndarray  # Share of paths where Provident wins, per age
+    crossover_age_probability: np.ndarray  # Share of paths whose crossover is each age
+    never_crossover_probability: float  # Share of paths where Provident never wins
+    n_paths: int  # Number of simulated paths
+    distribution: str  # "normal", "lognormal" or "bootstrap"
+    inflation_model: str = "constant"  # "constant" or "ar1"
+    provident_tax_bands: Optional[np.ndarray] = None  # Provident tax percentiles, shape (percentiles, ages)
+    personal_tax_bands: Optional[np.ndarray] = None  # Personal tax percentiles, shape (percentiles, ages)
+
+    def band(self, percentile: float) -> dict[str, np.ndarray]:
+        """Get the provident, personal and difference values at one percentile."""
+        matches = np.flatnonzero(np.isclose(self.percentiles, percentile))
+        if not matches.size:
+            raise ValueError(f"Percentile {percentile} was not computed")
+        index = matches[0]
+        band = {
+            "provident_net": self.provident_net_bands[index],
+            "personal_net": self.personal_net_bands[index],
+            "difference": self.difference_bands[index],
+        }
+        if self.provident_tax_bands is not None:
+            band["provident_tax"] = self.provident_tax_bands[index]
+            band["personal_tax"] = self.personal_tax_bands[index]
+        return band
+
+    def win_probability_at(self, starting_age: int) -> float:
+        """Probability that Provident wins for a given starting age."""
+        index = starting_age - int(self.starting_ages[0])
+        if not 0 <= index < len(self.starting_ages):
+            raise ValueError(f"Starting age {starting_age} was not simulated")
+        return float(self.provident_win_probability[index])
+
+
+@dataclass
+class MarketHistory:
+    """Historical index returns and inflation at a fixed frequency."""
+
+    dates: np.ndarray  # Period end dates (or years), oldest first
+    returns: np.ndarray  # Index total return per period (e.g., 0.01 = 1%)
+    inflation: np.ndarray  # CPI change per period
+    periods_per_year: int  # 12 for monthly data, 1 for annual
+
+    def __len__(self) -> int:
+        return len(self.returns)
+
+    @property
+    def years(self) -> float:
+        """Length of the history in years."""
+        return len(self.returns) / self.periods_per_year
+
+
+@dataclass
+class BacktestResult:
+    """Outcomes of replaying every rolling historical window."""
+
+    window_starts: np.ndarray  # First period of each window (the youngest age's start)
+    window_ends: np.ndarray  # Retirement period of each window
+    starting_ages: np.ndarray  # Starting ages analyzed
+    provident_net: np.ndarray  # Provident net at retirement, shape (windows, ages)
+    personal_net: np.ndarray  # Personal net at retirement, shape (windows, ages)
+    crossover_ages: np.ndarray  # First winning starting age per window (NaN if never)
+
+    @property
+    def difference(self) -> np.ndarray:
+        """Net difference (provident - personal) per window and age."""
+        return self.provident_net - self.personal_net
+
+    @property
+    def provident_win_rate(self) -> np.ndarray:
+        """Share of windows where Provident wins, per starting age."""
+        return (self.difference > 0).mean(axis=0)
+
+    def percentile_bands(self, percentiles=(5, 25, 50, 75, 95)) -> dict[str, np.ndarray]:
+        """Provident, personal and difference percentiles across windows, shape (percentiles, ages)."""
+        return {
+            "provident_net": np.percentile(self.provident_net, percentiles, axis=0),
+            "personal_net": np.percentile(self.personal_net, percentiles, axis=0),
+            "difference": np.percentile(self.difference, percentiles, axis=0),
+        }
+
+    def crossover_age_distribution(self) -> dict[Optional[int], float]:
+        """Share of windows per crossover age (None = Provident never wins)."""
+        ages, counts = np.unique(np.nan_to_num(self.crossover_ages, nan=-1), return_counts=True)
+        shares = counts / len(self.crossover_ages)
+        return {
+            (None if age < 0 else int(age)): float(share)
+            for age, share in zip(ages, shares)
+        }
+
+
+@dataclass(frozen=True)
+class HouseholdMember:
+    """One person in a household allocation."""
+
+    name: str  # Label shown in results
+    current_age: int  # Age at the first contribution
+    retirement_age: int  # Age at withdrawal
+    annual_cap: Optional[float] = None  # Personal Provident cap (household inputs' cap if None)
+
+
+@dataclass
+class HouseholdAllocation:
+    """Optimal year-by-year split of a household budget across members' accounts."""
+
+    members: list[HouseholdMember]  # Members, in input order
+    years: np.ndarray  # Household year (1 = first year of contributions)
+    annual_budget: np.ndarray  # Budget available in each year
+    provident_contributions: np.ndarray  # Provident deposit per (year, member)
+    personal_contributions: np.ndarray  # Personal deposit per (year, member)
+    provident_value_per_shekel: np.ndarray  # Discounted net value of 1 NIS deposited, per (year, member)
+    personal_value_per_shekel: np.ndarray  # Same for the personal account
+
+    @property
+    def member_values(self) -> np.ndarray:
+        """Discounted after-tax value at retirement per member."""
+        return (
+            self.provident_contributions * self.provident_value_per_shekel
+            + self.personal_contributions * self.personal_value_per_shekel
+        ).sum(axis=0)
+
+    @property
+    def total_value(self) -> float:
+        """Discounted after-tax value of the whole household."""
+        return float(self.member_values.sum())
+
+    def to_pandas(self):
+        """Contribution schedule, one row per (year, member) still contributing."""
+        import pandas as pd
+
+        n_years, n_members = self.provident_contributions.shape
+        ages = np.array([member.current_age for member in self.members])[None, :] + self.years[:, None]
+        active = ages <= np.array([member.retirement_age for member in self.members])[None, :]
+        frame = pd.DataFrame({
+            "Year": np.repeat(self.years, n_members),
+            "Member": np.tile([member.name for member in self.members], n_years),
+            "Age": ages.ravel(),
+            "Provident Contribution": self.provident_contributions.ravel(),
+            "Personal Contribution": self.personal_contributions.ravel(),
+        })
+        return frame[active.ravel()].reset_index(drop=True)
+
+
+@dataclass
+class ContributionSchedule:
+    """Optimal year-by-year contribution plan for one person."""
+
+    ages: np.ndarray  # Age at each deposit (end of year)
+    budget: np.ndarray  # New money available each year
+    provident_contributions: np.ndarray  # Provident deposit each year
+    personal_contributions: np.ndarray  # Personal deposit each year
+    cash_carried: np.ndarray  # Unspent cash carried into the next year
+    total_value: float  # After-tax value at retirement of the whole plan
+
+    def to_pandas(self):
+        """One row per year."""
+        import pandas as pd
+
+        return pd.DataFrame({
+            "Age": self.ages,
+            "Budget": self.budget,
+            "Provident Contribution": self.provident_contributions,
+            "Personal Contribution": self.personal_contributions,
+            "Cash Carried": self.cash_carried,
+        })
+
+
+@dataclass
+class SplitWithdrawalResult:
+    """Partial lump sum / partial annuity outcomes over (fraction x starting age)."""
+
+    fractions: np.ndarray  # Share of the Provident balance taken as a lump sum
+    starting_ages: np.ndarray  # Starting ages analyzed
+    lump_sum_net: np.ndarray  # Lump sum after tax, shape (fractions, ages)
+    monthly_income: np.ndarray  # Annuity income per month, shape (fractions, ages)
+    total_value: np.ndarray  # Lump sum net + annuitized value, shape (fractions, ages)
+    feasible: np.ndarray  # Whether each split meets the lump-sum / income minimums
+    best_fraction: np.ndarray  # Best feasible fraction per age (NaN if none)
+    best_value: np.ndarray  # Total value at the best fraction per age (NaN if none)
+
+    def best_for(self, starting_age: int) -> Optional[dict[str, float]]:
+        """Best split for a starting age, or None if no split is feasible."""
+        index = starting_age - int(self.starting_ages[0])
+        if not 0 <= index < len(self.starting_ages):
+            raise ValueError(f"Starting age {starting_age} was not analyzed")
+        if np.isnan(self.best_fraction[index]):
+            return None
+        row = int(np.flatnonzero(self.fractions == self.best_fraction[index])[0])
+        return {
+            "lump_sum_fraction": float(self.best_fraction[index]),
+            "lump_sum_net": float(self.lump_sum_net[row, index]),
+            "monthly_income": float(self.monthly_income[row, index]),
+            "total_value": float(self.total_value[row, index]),
+        }
+
+
+@dataclass
+class MonthlyTrajectory:
+    """Month-by-month balances from the monthly accumulation engine."""
+
+    starting_age: int  # Age at the first deposit
+    months: np.ndarray  # Month number (0 = before the first deposit)
+    provident_balance: np.ndarray  # Provident balance after each month
+    provident_contributions: np.ndarray  # Provident deposits to date (after the cap)
+    provident_inflation_adjusted: np.ndarray  # Provident deposits indexed to each month
+    personal_balance: np.ndarray  # Personal balance after each month
+    personal_contributions: np.ndarray  # Personal deposits to date
+
+    def to_yearly_results(self) -> list[YearlyResult]:
+        """Roll the trajectory up to year-end values, as in generate_yearly_growth."""
+        year_ends = self.months[12::12]
+        return [
+            YearlyResult(
+                year=year,
+                age=self.starting_age + year,
+                provident_fv=provident_fv,
+                provident_contributions=provident_contributions,
+                personal_fv=personal_fv,
+                personal_contributions=personal_contributions,
+            )
+            for year, provident_fv, provident_contributions, personal_fv, personal_contributions in zip(
+                (year_ends // 12).tolist(),
+                self.provident_balance[year_ends].tolist(),
+                self.provident_contributions[year_ends].tolist(),
+                self.personal_balance[year_ends].tolist(),
+                self.personal_contributions[year_ends].tolist(),
+            )
+        ]
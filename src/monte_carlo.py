@@ -0,0 +1,426 @@
+"""Monte Carlo engine for stochastic Provident Fund vs personal account returns.
+
+Instead of constant expected returns, each account earns a random annual
+return drawn per path and per year. The paths share calendar years, so
+every starting age is evaluated on the same market history ending at
+retirement. All paths in a chunk are simulated as a (paths x years)
+matrix without Python loops over paths.
+
+Inflation is either constant or follows an AR(1) process around the input
+rate whose shocks are correlated with the market return shocks (a
+restricted VAR(1)). With stochastic inflation, the Provident real-gains
+basis is indexed per path, while the personal account is still taxed on
+nominal gains.
+
+Memory depends on chunk_size, not n_paths: each chunk is folded into
+per-age histograms (whose ranges are set from the first chunk) and win /
+crossover counts, and percentiles are read from the histograms. A run
+that fits in one chunk reports exact percentiles.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from .models import ProvidentInputs, MonteCarloResult
+from .calculator import (
+    calculate_inflation_adjusted_contributions_array,
+    apply_taxes,
+    is_annuity_exempt,
+)
+
+
+DISTRIBUTIONS = ("normal", "lognormal", "bootstrap")
+INFLATION_MODELS = ("constant", "ar1")
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+DEFAULT_VOLATILITY = 0.15  # Annual standard deviation of returns (equity-like)
+DEFAULT_CHUNK_SIZE = 10_000  # Paths simulated per chunk
+HISTOGRAM_BINS = 4096  # Bins per age for percentiles across chunks
+DEFAULT_INFLATION_VOLATILITY = 0.01  # Annual inflation shock standard deviation
+DEFAULT_INFLATION_PERSISTENCE = 0.6  # AR(1) coefficient of inflation
+DEFAULT_INFLATION_CORRELATION = -0.2  # Correlation of inflation and return shocks
+
+
+def _draw_returns(
+    rng: np.random.Generator,
+    n_paths: int,
+    n_years: int,
+    expected_returns: tuple[float, float],
+    volatilities: tuple[float, float],
+    correlation: float,
+    distribution: str,
+    historical_returns: Optional[np.ndarray],
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Draw gross annual returns for both accounts.
+
+    Args:
+        rng: Random generator
+        n_paths: Number of paths
+        n_years: Number of years per path
+        expected_returns: Expected (provident, personal) annual return
+        volatilities: (provident, personal) annual standard deviation
+        correlation: Correlation between the two accounts' shocks
+        distribution: "normal", "lognormal" or "bootstrap"
+        historical_returns: Annual returns to resample for "bootstrap"
+
+    Returns:
+        Tuple of (provident, personal) return matrices, each (paths x years)
+    """
+    if distribution == "bootstrap":
+        # Resample historical years (same year for both accounts) and shift
+        # the demeaned history onto each account's expected return
+        history = np.asarray(historical_returns, dtype=float)
+        shocks = history - history.mean()
+        years = rng.integers(0, len(history), size=(n_paths, n_years))
+        sampled = shocks[years]
+        return expected_returns[0] + sampled, expected_returns[1] + sampled
+
+    z_provident = rng.standard_normal((n_paths, n_years))
+    z_independent = rng.standard_normal((n_paths, n_years))
+    z_personal = correlation * z_provident + np.sqrt(1 - correlation**2) * z_independent
+
+    returns = []
+    for z, mean, volatility in zip(
+        (z_provident, z_personal), expected_returns, volatilities
+    ):
+        if distribution == "lognormal":
+            # log(1 + r) is normal, matched to the requested mean and volatility
+            sigma = np.sqrt(np.log1p((volatility / (1 + mean)) ** 2))
+            mu = np.log1p(mean) - sigma**2 / 2
+            returns.append(np.expm1(mu + sigma * z))
+        else:
+            returns.append(mean + volatility * z)
+
+    return returns[0], returns[1]
+
+
+def _draw_inflation(
+    rng: np.random.Generator,
+    market_returns: np.ndarray,
+    mean: float,
+    volatility: float,
+    persistence: float,
+    correlation: float,
+) -> np.ndarray:
+    """
+    Draw AR(1) inflation paths correlated with the market returns.
+
+    inflation[t] = mean + persistence * (inflation[t - 1] - mean) + volatility * e[t]
+
+    where e[t] has the given correlation with the standardized market
+    return of year t. Paths start at the long-run mean. The recursion
+    loops over years only; all paths advance together.
+
+    Args:
+        rng: Random generator
+        market_returns: Market returns driving the shocks, (paths x years)
+        mean: Long-run inflation rate
+        volatility: Standard deviation of the inflation shocks
+        persistence: AR(1) coefficient, in (-1, 1)
+        correlation: Correlation between inflation and market shocks
+
+    Returns:
+        Inflation matrix (paths x years)
+    """
+    spread = market_returns.std()
+    market_shocks = (market_returns - market_returns.mean()) / (spread if spread > 0 else 1.0)
+    shocks = volatility * (
+        correlation * market_shocks
+        + np.sqrt(1 - correlation**2) * rng.standard_normal(market_returns.shape)
+    )
+
+    inflation = np.empty_like(shocks)
+    previous = np.full(shocks.shape[0], mean)
+    for year in range(shocks.shape[1]):
+        previous = mean + persistence * (previous - mean) + shocks[:, year]
+        inflation[:, year] = previous
+    return inflation
+
+
+def _future_values_by_horizon(
+    contribution: float,
+    net_returns: np.ndarray,
+) -> np.ndarray:
+    """
+    Future value at retirement for every horizon, per path.
+
+    A contribution at the end of year t grows by the product of the later
+    years' growth factors, so a reverse cumulative product gives every
+    contribution's growth and a cumulative sum over the most recent years
+    gives the balance for each horizon.
+
+    Args:
+        contribution: Annual contribution
+        net_returns: Net annual returns, (paths x years), last year ends at retirement
+
+    Returns:
+        Array (paths x years + 1) where column n is the balance after n years
+    """
+    growth = 1 + net_returns
+    n_paths = growth.shape[0]
+
+    # growth_after[:, t] = product of growth over years after year t
+    growth_after = np.ones_like(growth)
+    growth_after[:, :-1] = np.cumprod(growth[:, :0:-1], axis=1)[:, ::-1]
+
+    balances = np.zeros((n_paths, growth.shape[1] + 1))
+    balances[:, 1:] = contribution * np.cumsum(growth_after[:, ::-1], axis=1)
+    return balances
+
+
+def _percentile_bands(
+    values: np.ndarray,
+    percentiles: np.ndarray,
+) -> np.ndarray:
+    """
+    Percentiles along the path axis, sorting in place.
+
+    Equivalent to ``np.percentile(values, percentiles, axis=1)`` with linear
+    interpolation, but one in-place sort is cheaper than repeated partitions.
+
+    Args:
+        values: Array (ages x paths), sorted in place
+        percentiles: Percentiles in [0, 100]
+
+    Returns:
+        Array (percentiles x ages)
+    """
+    values.sort(axis=1)
+    positions = percentiles / 100 * (values.shape[1] - 1)
+    lower = np.floor(positions).astype(int)
+    upper = np.minimum(lower + 1, values.shape[1] - 1)
+    weight = (positions - lower)[:, None]
+    low_values = values[:, lower].T.astype(float)
+    high_values = values[:, upper].T.astype(float)
+    return low_values + weight * (high_values - low_values)
+
+
+class _HistogramBands:
+    """
+    Per-age histograms that give approximate percentiles for any number of paths.
+
+    The bin range of each age is the first chunk's range padded by half
+    its span on both sides; values outside it fall into under/overflow
+    bins bounded by the exact running minimum and maximum. Percentiles are
+    interpolated within their bin, so their error is at most one bin width
+    (1 / HISTOGRAM_BINS of the padded range) inside the range.
+    """
+
+    def __init__(self, sample: np.ndarray, n_bins: int = HISTOGRAM_BINS):
+        """
+        Args:
+            sample: First chunk's values, (paths x ages); not added to the counts
+            n_bins: Bins per age inside the range
+        """
+        low, high = sample.min(axis=0), sample.max(axis=0)
+        span = high - low
+        pad = np.where(span > 0, span / 2, np.maximum(np.abs(low) * 1e-6, 1.0))
+        self.n_bins = n_bins
+        self.low = low - pad
+        self.width = (span + 2 * pad) / n_bins
+        # Column 0 is the underflow bin, column n_bins + 1 the overflow bin
+        self.counts = np.zeros((sample.shape[1], n_bins + 2), dtype=np.int64)
+        self.minimum = np.full(sample.shape[1], np.inf)
+        self.maximum = np.full(sample.shape[1], -np.inf)
+
+    def add(self, values: np.ndarray) -> None:
+        """Count a chunk of values, (paths x ages)."""
+        n_ages = values.shape[1]
+        bins = np.floor((values - self.low) / self.width) + 1
+        bins = np.clip(bins, 0, self.n_bins + 1).astype(np.intp)
+        flat = bins + np.arange(n_ages) * (self.n_bins + 2)
+        self.counts += np.bincount(flat.ravel(), minlength=self.counts.size).reshape(self.counts.shape)
+        self.minimum = np.minimum(self.minimum, values.min(axis=0))
+        self.maximum = np.maximum(self.maximum, values.max(axis=0))
+
+    def percentiles(self, percentiles: np.ndarray) -> np.ndarray:
+        """Percentiles per age, shape (percentiles x ages)."""
+        cumulative = np.cumsum(self.counts, axis=1)
+        ranks = percentiles[:, None] / 100 * (cumulative[:, -1] - 1)  # (percentiles, ages)
+        bins = (cumulative[None, :, :] > ranks[:, :, None]).argmax(axis=2)
+
+        ages = np.arange(self.counts.shape[0])[None, :]
+        counts = self.counts[ages, bins]
+        before = cumulative[ages, bins] - counts
+
+        edges_low = np.where(bins == 0, self.minimum, self.low + (bins - 1) * self.width)
+        edges_high = np.where(bins == self.n_bins + 1, self.maximum, self.low + bins * self.width)
+        fraction = (ranks - before + 0.5) / counts
+        values = edges_low + fraction * (edges_high - edges_low)
+        return np.clip(values, self.minimum, self.maximum)
+
+
+def run_monte_carlo(
+    inputs: ProvidentInputs,
+    n_paths: int = 10_000,
+    distribution: str = "normal",
+    provident_volatility: float = DEFAULT_VOLATILITY,
+    personal_volatility: float = DEFAULT_VOLATILITY,
+    correlation: float = 0.9,
+    historical_returns: Optional[list[float]] = None,
+    inflation_model: str = "constant",
+    inflation_volatility: float = DEFAULT_INFLATION_VOLATILITY,
+    inflation_persistence: float = DEFAULT_INFLATION_PERSISTENCE,
+    inflation_correlation: float = DEFAULT_INFLATION_CORRELATION,
+    percentiles: tuple[float, ...] = DEFAULT_PERCENTILES,
+    seed: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    min_age: int = 18,
+    max_age: int = 59,
+) -> MonteCarloResult:
+    """
+    Simulate stochastic returns and compare net outcomes across starting ages.
+
+    Paths are simulated in chunks, and only per-age aggregates are kept
+    across chunks, so memory depends on chunk_size and not n_paths.
+    Percentiles are exact when n_paths <= chunk_size and read from per-age
+    histograms otherwise. For a given seed and chunk_size the results are
+    reproducible.
+
+    Args:
+        inputs: All input parameters (expected returns are the path means)
+        n_paths: Number of simulated paths
+        distribution: "normal", "lognormal" or "bootstrap"
+        provident_volatility: Annual standard deviation of Provident returns
+        personal_volatility: Annual standard deviation of personal returns
+        correlation: Correlation between the accounts' return shocks
+        historical_returns: Annual returns to resample (required for "bootstrap")
+        inflation_model: "constant" (inputs.inflation_rate) or "ar1"
+        inflation_volatility: Standard deviation of AR(1) inflation shocks
+        inflation_persistence: AR(1) coefficient of inflation
+        inflation_correlation: Correlation of inflation shocks with Provident return shocks
+        percentiles: Percentiles to report in the bands
+        seed: Seed for the random generator
+        chunk_size: Paths simulated per chunk
+        min_age: Minimum starting age to analyze
+        max_age: Maximum starting age to analyze
+
+    Returns:
+        MonteCarloResult with percentile bands and win/crossover probabilities
+    """
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution: {distribution}")
+    if distribution == "bootstrap" and not historical_returns:
+        raise ValueError("Bootstrap sampling requires historical_returns")
+    if inflation_model not in INFLATION_MODELS:
+        raise ValueError(f"Unknown inflation model: {inflation_model}")
+    if n_paths <= 0:
+        raise ValueError("n_paths must be positive")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+
+    starting_ages = np.arange(min_age, max_age + 1)
+    investment_years = np.maximum(inputs.retirement_age - starting_ages, 0)
+    n_years = int(investment_years.max(initial=0))
+    n_ages = len(starting_ages)
+
+    contribution = inputs.annual_contribution
+    contributions = contribution * investment_years.astype(float)
+    inflation_adjusted = calculate_inflation_adjusted_contributions_array(
+        contribution, inputs.inflation_rate, investment_years
+    )
+    annuity_exempt = is_annuity_exempt(inputs.withdrawal_mode, inputs.retirement_age)
+
+    band_names = ("provident_net", "personal_net", "difference", "provident_tax", "personal_tax")
+    first_chunk: Optional[dict[str, np.ndarray]] = None
+    histograms: dict[str, _HistogramBands] = {}
+    win_counts = np.zeros(n_ages, dtype=np.int64)
+    # Index 0 counts paths that never cross; index k + 1 counts crossover at age k
+    crossover_counts = np.zeros(n_ages + 1, dtype=np.int64)
+
+    rng = np.random.default_rng(seed)
+
+    for start in range(0, n_paths, chunk_size):
+        stop = min(start + chunk_size, n_paths)
+
+        provident_returns, personal_returns = _draw_returns(
+            rng,
+            stop - start,
+            n_years,
+            expected_returns=(inputs.provident_expected_return, inputs.personal_expected_return),
+            volatilities=(provident_volatility, personal_volatility),
+            correlation=correlation,
+            distribution=distribution,
+            historical_returns=historical_returns,
+        )
+
+        # Net of fees: (1 + gross) * (1 - fee) - 1
+        provident_balances = _future_values_by_horizon(
+            contribution, (1 + provident_returns) * (1 - inputs.provident_mgmt_fee) - 1
+        )
+        personal_balances = _future_values_by_horizon(
+            contribution, (1 + personal_returns) * (1 - inputs.personal_mgmt_fee) - 1
+        )
+
+        if inflation_model == "ar1":
+            # Each deposit is indexed by its path's CPI growth up to retirement,
+            # the same reverse-cumprod / cumsum as the balances
+            inflation = _draw_inflation(
+                rng,
+                provident_returns,
+                mean=inputs.inflation_rate,
+                volatility=inflation_volatility,
+                persistence=inflation_persistence,
+                correlation=inflation_correlation,
+            )
+            chunk_inflation_adjusted = _future_values_by_horizon(contribution, inflation)[
+                :, investment_years
+            ]
+        else:
+            chunk_inflation_adjusted = inflation_adjusted
+
+        values = apply_taxes(
+            {
+                "provident_gross": provident_balances[:, investment_years],
+                "personal_gross": personal_balances[:, investment_years],
+                "contributions": contributions,
+                "provident_inflation_adjusted": chunk_inflation_adjusted,
+            },
+            capital_gains_tax=inputs.capital_gains_tax,
+            annuity_exempt=annuity_exempt,
+        )
+
+        values["difference"] = values["provident_net"] - values["personal_net"]
+        chunk = {name: values[name] for name in band_names}
+        if first_chunk is None:
+            # Kept until a second chunk arrives; then it sets the histogram ranges
+            first_chunk = chunk
+        else:
+            if not histograms:
+                histograms = {name: _HistogramBands(first_chunk[name]) for name in band_names}
+                for name in band_names:
+                    histograms[name].add(first_chunk[name])
+            for name in band_names:
+                histograms[name].add(chunk[name])
+
+        wins = values["provident_net"] > values["personal_net"]
+        win_counts += wins.sum(axis=0)
+        first_win = np.where(wins.any(axis=1), wins.argmax(axis=1) + 1, 0)
+        crossover_counts += np.bincount(first_win, minlength=n_ages + 1)
+
+    percentiles = np.asarray(percentiles, dtype=float)
+    if histograms:
+        bands = {name: histograms[name].percentiles(percentiles) for name in band_names}
+    else:
+        # Age-major copy so each age's sort reads contiguous memory
+        bands = {
+            name: _percentile_bands(np.ascontiguousarray(first_chunk[name].T), percentiles)
+            for name in band_names
+        }
+
+    return MonteCarloResult(
+        starting_ages=starting_ages,
+        percentiles=percentiles,
+        provident_net_bands=bands["provident_net"],
+        personal_net_bands=bands["personal_net"],
+        difference_bands=bands["difference"],
+        provident_win_probability=win_counts / n_paths,
+        crossover_age_probability=crossover_counts[1:] / n_paths,
+        never_crossover_probability=float(crossover_counts[0] / n_paths),
+        n_paths=n_paths,
+        distribution=distribution,
+        inflation_model=inflation_model,
+        provident_tax_bands=bands["provident_tax"],
+        personal_tax_bands=bands["personal_tax"],
+    )
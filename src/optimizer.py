@@ -0,0 +1,249 @@
+"""Contribution optimizers under the per-person Provident cap.
+
+Household split
+---------------
+
+A household shares an annual budget across each member's Provident Fund
+(capped per person per year) and personal account. Growth, fees and tax
+are linear in each deposit, so a shekel deposited in a given year into a
+given account has a fixed after-tax value at that member's retirement.
+Each year's allocation is therefore an independent fractional knapsack,
+and the greedy fill is optimal: accounts are filled in decreasing order
+of value per shekel, Provident Funds up to their cap, and the uncapped
+personal accounts absorb the rest. All years are solved at once as a
+(years x accounts) matrix.
+
+Members retire at different dates, so values are discounted to today (at
+the inflation rate by default) before they are compared.
+
+Lifetime schedule
+-----------------
+For one person with a year-by-year budget, unspent money can also be held
+as cash and deposited later, e.g., to fill future Provident cap room with
+a one-off windfall. That couples the years, so the schedule is solved by
+backward dynamic programming over (year x cash carried), with the cash
+state on a grid and each year's transition evaluated as one
+(cash x next cash) matrix.
+"""
+
+from typing import Optional, Union
+
+import numpy as np
+
+from .models import ProvidentInputs, HouseholdMember, HouseholdAllocation, ContributionSchedule
+from .calculator import apply_taxes, is_annuity_exempt
+
+
+def household_values_per_shekel(
+    base_inputs: ProvidentInputs,
+    members: list[HouseholdMember],
+    discount_rate: Optional[float] = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Discounted after-tax value of 1 NIS deposited in each year and account.
+
+    A deposit at the end of household year t by a member with horizon n
+    grows for n - t years and is taxed on its own gain at retirement.
+
+    Args:
+        base_inputs: Shared rates, fees, tax rate and withdrawal mode
+        members: Household members
+        discount_rate: Annual rate to discount retirement values to today
+            (base_inputs.inflation_rate if None)
+
+    Returns:
+        Tuple of (provident, personal) value arrays of shape (years, members);
+        years after a member retires are NaN
+    """
+    if discount_rate is None:
+        discount_rate = base_inputs.inflation_rate
+
+    retirement_ages = np.array([member.retirement_age for member in members])
+    horizons = np.maximum(retirement_ages - np.array([member.current_age for member in members]), 0)
+    years = np.arange(1, int(horizons.max(initial=0)) + 1)
+
+    # Axes: (year, member); remaining growth years of each deposit
+    growth_years = (horizons[None, :] - years[:, None]).astype(float)
+    active = growth_years >= 0
+    growth_years = np.maximum(growth_years, 0.0)
+
+    per_deposit = {
+        "provident_gross": (1 + base_inputs.get_provident_net_return()) ** growth_years,
+        "personal_gross": (1 + base_inputs.get_personal_net_return()) ** growth_years,
+        "contributions": np.ones_like(growth_years),
+        "provident_inflation_adjusted": (1 + base_inputs.inflation_rate) ** growth_years,
+    }
+
+    # The annuity exemption depends on each member's retirement age
+    exempt = np.array([
+        is_annuity_exempt(base_inputs.withdrawal_mode, age) for age in retirement_ages
+    ])
+    taxed, untaxed = (
+        apply_taxes(per_deposit, base_inputs.capital_gains_tax, annuity_exempt=flag)
+        for flag in (False, True)
+    )
+    provident_net = np.where(exempt[None, :], untaxed["provident_net"], taxed["provident_net"])
+
+    discount = (1 + discount_rate) ** -horizons.astype(float)
+    return (
+        np.where(active, provident_net * discount, np.nan),
+        np.where(active, taxed["personal_net"] * discount, np.nan),
+    )
+
+
+def optimize_household(
+    base_inputs: ProvidentInputs,
+    members: list[HouseholdMember],
+    annual_budget: Union[float, np.ndarray],
+    discount_rate: Optional[float] = None,
+) -> HouseholdAllocation:
+    """
+    Split a household budget to maximize total after-tax value.
+
+    Args:
+        base_inputs: Shared rates, fees, tax rate, withdrawal mode and default cap
+        members: Household members (at least one)
+        annual_budget: Amount contributed per year across all accounts; a
+            scalar, or one value per household year
+        discount_rate: Annual rate to discount retirement values to today
+            (base_inputs.inflation_rate if None)
+
+    Returns:
+        HouseholdAllocation with the optimal (year x member) contribution schedule
+    """
+    if not members:
+        raise ValueError("A household needs at least one member")
+
+    provident_values, personal_values = household_values_per_shekel(
+        base_inputs, members, discount_rate
+    )
+    n_years, n_members = provident_values.shape
+    years = np.arange(1, n_years + 1)
+
+    budget = np.broadcast_to(np.asarray(annual_budget, dtype=float), (n_years,))
+    if (budget < 0).any():
+        raise ValueError("Annual budget must be non-negative")
+
+    caps = np.array([
+        base_inputs.annual_cap if member.annual_cap is None else member.annual_cap
+        for member in members
+    ], dtype=float)
+
+    # Slots: every Provident (capped), then every personal account (uncapped);
+    # retired members' slots have no capacity
+    values = np.concatenate([provident_values, personal_values], axis=1)
+    active = ~np.isnan(values)
+    capacities = np.where(
+        active, np.concatenate([caps, np.full(n_members, np.inf)])[None, :], 0.0
+    )
+
+    # Greedy fill per year: sort slots by value (stable, so Provident wins ties)
+    order = np.argsort(-np.where(active, values, -np.inf), axis=1, kind="stable")
+    sorted_capacity = np.take_along_axis(capacities, order, axis=1)
+    filled_before = np.zeros_like(sorted_capacity)
+    filled_before[:, 1:] = np.cumsum(sorted_capacity[:, :-1], axis=1)
+    sorted_allocation = np.clip(budget[:, None] - filled_before, 0.0, sorted_capacity)
+
+    allocation = np.empty_like(sorted_allocation)
+    np.put_along_axis(allocation, order, sorted_allocation, axis=1)
+
+    return HouseholdAllocation(
+        members=list(members),
+        years=years,
+        annual_budget=np.array(budget),
+        provident_contributions=allocation[:, :n_members],
+        personal_contributions=allocation[:, n_members:],
+        provident_value_per_shekel=np.nan_to_num(provident_values),
+        personal_value_per_shekel=np.nan_to_num(personal_values),
+    )
+
+
+DEFAULT_CASH_GRID_SIZE = 201  # Cash states in the schedule DP
+
+
+def _split_deposit(amount, provident_value, personal_value, cap):
+    """Best (provident, personal) split of a deposit, given per-shekel values."""
+    provident = np.where(provident_value >= personal_value, np.minimum(amount, cap), 0.0)
+    return provident, amount - provident
+
+
+def optimize_contribution_schedule(
+    inputs: ProvidentInputs,
+    budget_schedule: Optional[tuple[float, ...]] = None,
+    cash_return: float = 0.0,
+    cash_grid_size: int = DEFAULT_CASH_GRID_SIZE,
+) -> ContributionSchedule:
+    """
+    Find the contribution schedule that maximizes after-tax value at retirement.
+
+    Each year new money arrives; it can go to the Provident Fund (up to the
+    annual cap), to the personal account, or be carried as cash that earns
+    cash_return. Cash left at retirement counts at face value. Values are
+    in retirement-date shekels.
+
+    Args:
+        inputs: All input parameters (annual_contribution is the default budget)
+        budget_schedule: New money per year from current age to retirement
+            (annual_contribution every year if None)
+        cash_return: Annual return on carried cash
+        cash_grid_size: Number of cash states; finer grids cost quadratically more
+
+    Returns:
+        ContributionSchedule with the optimal plan and its value
+    """
+    member = HouseholdMember("self", inputs.current_age, inputs.retirement_age)
+    provident_values, personal_values = household_values_per_shekel(inputs, [member], discount_rate=0.0)
+    provident_values, personal_values = provident_values[:, 0], personal_values[:, 0]
+    n_years = len(provident_values)
+
+    if budget_schedule is None:
+        budget = np.full(n_years, float(inputs.annual_contribution))
+    else:
+        budget = np.asarray(budget_schedule, dtype=float)
+        if budget.shape != (n_years,):
+            raise ValueError(f"budget_schedule needs {n_years} values, one per year")
+    cap = float(inputs.annual_cap)
+
+    # Cash states: 0 .. everything ever received (with growth) on a uniform grid
+    cash_growth = 1 + cash_return
+    max_cash = 0.0
+    for amount in budget:
+        max_cash = max_cash * cash_growth + amount
+    grid = np.linspace(0.0, max_cash, cash_grid_size)
+
+    # Backward pass. value[j] = best value from next year on, holding grid[j] cash.
+    value = grid.copy()  # Cash left at retirement counts at face value
+    policy = np.zeros((n_years, cash_grid_size), dtype=np.intp)
+    for year in range(n_years - 1, -1, -1):
+        available = grid[:, None] * cash_growth + budget[year]  # (cash now, 1)
+        deposit = available - grid[None, :]  # Deposit if carrying grid[j] forward
+        provident, personal = _split_deposit(
+            np.maximum(deposit, 0.0), provident_values[year], personal_values[year], cap
+        )
+        total = provident * provident_values[year] + personal * personal_values[year] + value[None, :]
+        total = np.where(deposit >= 0, total, -np.inf)
+        policy[year] = total.argmax(axis=1)
+        value = total[np.arange(cash_grid_size), policy[year]]
+
+    # Forward pass from zero cash
+    provident_schedule = np.zeros(n_years)
+    personal_schedule = np.zeros(n_years)
+    carried = np.zeros(n_years)
+    state = 0
+    for year in range(n_years):
+        next_state = policy[year, state]
+        deposit = grid[state] * cash_growth + budget[year] - grid[next_state]
+        provident_schedule[year], personal_schedule[year] = _split_deposit(
+            deposit, provident_values[year], personal_values[year], cap
+        )
+        carried[year] = grid[next_state]
+        state = next_state
+
+    return ContributionSchedule(
+        ages=inputs.current_age + np.arange(1, n_years + 1),
+        budget=budget,
+        provident_contributions=provident_schedule,
+        personal_contributions=personal_schedule,
+        cash_carried=carried,
+        total_value=float(value[0]) if n_years else 0.0,
+    )
@@ -4,13 +4,10 @@ import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
 import numpy as np
-from typing import Optional
+from typing import Optional, Union
 
-from ..models import ComparisonSummary, YearlyResult, AgeComparisonResult, MonthlyWithdrawalResult
-from ..calculator import (
-    generate_sensitivity_analysis,
-    calculate_tax_comparison,
-)
+from ..models import ComparisonSummary, YearlyResult, AgeComparisonResult, MonthlyWithdrawalResult, SensitivityGrid, YearlyGrowthTable
+from ..cache import evaluate_sensitivity_grid
 
 
 # Color palette
@@ -35,9 +32,9 @@ def create_age_crossover_chart(summary: ComparisonSummary) -> go.Figure:
     Returns:
         Plotly Figure object
     """
-    ages = [r.starting_age for r in summary.age_results]
-    provident_nets = [r.provident_net for r in summary.age_results]
-    personal_nets = [r.personal_net for r in summary.age_results]
+    ages = summary.age_results.column("starting_age").tolist()
+    provident_nets = summary.age_results.column("provident_net").tolist()
+    personal_nets = summary.age_results.column("personal_net").tolist()
 
     fig = go.Figure()
 
@@ -70,11 +67,7 @@ def create_age_crossover_chart(summary: ComparisonSummary) -> go.Figure:
     # Mark crossover point if it exists
     if summary.crossover_age:
         # Find the result for crossover age
-        crossover_result = None
-        for r in summary.age_results:
-            if r.starting_age == summary.crossover_age:
-                crossover_result = r
-                break
+        crossover_result = summary.age_results.get(summary.crossover_age)
         
         if crossover_result:
             fig.add_trace(
@@ -127,8 +120,8 @@ def create_difference_by_age_chart(summary: ComparisonSummary) -> go.Figure:
     Returns:
         Plotly Figure object
     """
-    ages = [r.starting_age for r in summary.age_results]
-    differences = [r.difference for r in summary.age_results]
+    ages = summary.age_results.column("starting_age").tolist()
+    differences = summary.age_results.difference.tolist()
     colors = [PROVIDENT_COLOR if d > 0 else PERSONAL_COLOR for d in differences]
 
     fig = go.Figure(
@@ -178,12 +171,14 @@ def create_difference_by_age_chart(summary: ComparisonSummary) -> go.Figure:
     return fig
 
 
-def create_growth_comparison_chart(yearly_results: list[YearlyResult]) -> go.Figure:
+def create_growth_comparison_chart(
+    yearly_results: Union[YearlyGrowthTable, list[YearlyResult]],
+) -> go.Figure:
     """
     Create a line chart comparing growth trajectories over time.
 
     Args:
-        yearly_results: List of YearlyResult from generate_yearly_growth
+        yearly_results: YearlyGrowthTable from generate_yearly_growth (or a list of YearlyResult)
 
     Returns:
         Plotly Figure object
@@ -201,10 +196,16 @@ def create_growth_comparison_chart(yearly_results: list[YearlyResult]) -> go.Fig
         )
         return fig
 
-    years = [yr.year for yr in yearly_results]
-    ages = [yr.age for yr in yearly_results]
-    provident_values = [yr.provident_fv for yr in yearly_results]
-    personal_values = [yr.personal_fv for yr in yearly_results]
+    if isinstance(yearly_results, YearlyGrowthTable):
+        years = yearly_results.column("year")
+        ages = yearly_results.column("age")
+        provident_values = yearly_results.column("provident_fv")
+        personal_values = yearly_results.column("personal_fv")
+    else:
+        years = [yr.year for yr in yearly_results]
+        ages = [yr.age for yr in yearly_results]
+        provident_values = [yr.provident_fv for yr in yearly_results]
+        personal_values = [yr.personal_fv for yr in yearly_results]
 
     fig = go.Figure()
 
@@ -251,6 +252,60 @@ def create_growth_comparison_chart(yearly_results: list[YearlyResult]) -> go.Fig
     return fig
 
 
+def create_growth_by_starting_age_chart(
+    growth_matrix: dict[str, np.ndarray],
+    starting_ages: list[int],
+) -> go.Figure:
+    """
+    Create a line chart of growth trajectories for several starting ages.
+
+    Args:
+        growth_matrix: Result of calculate_growth_matrix
+        starting_ages: Starting ages to draw
+
+    Returns:
+        Plotly Figure object
+    """
+    fig = go.Figure()
+    first_age = int(growth_matrix["starting_age"][0])
+    palette = px.colors.qualitative.Safe
+
+    for i, starting_age in enumerate(sorted(starting_ages)):
+        row = starting_age - first_age
+        if not 0 <= row < len(growth_matrix["starting_age"]):
+            continue
+        active = ~np.isnan(growth_matrix["provident_fv"][row])
+        ages = growth_matrix["age"][row][active]
+        color = palette[i % len(palette)]
+
+        for account, dash in (("provident", "solid"), ("personal", "dash")):
+            label = "Provident" if account == "provident" else "Personal"
+            fig.add_trace(
+                go.Scatter(
+                    x=ages,
+                    y=growth_matrix[f"{account}_fv"][row][active],
+                    mode="lines",
+                    name=f"Start {starting_age} - {label}",
+                    legendgroup=str(starting_age),
+                    line=dict(color=color, width=2, dash=dash),
+                    hovertemplate=f"Start {starting_age}<br>Age %{{x}}<br>Value: ₪%{{y:,.0f}}<extra>{label}</extra>",
+                )
+            )
+
+    fig.update_layout(
+        title="Growth by Starting Age (solid: Provident, dashed: Personal)",
+        xaxis_title="Age",
+        yaxis_title="Value (₪)",
+        hovermode="closest",
+        template="plotly_white",
+        height=450,
+    )
+
+    fig.update_yaxes(tickformat=",")
+
+    return fig
+
+
 def create_tax_comparison_chart(tax_data: dict) -> go.Figure:
     """
     Create a bar chart comparing tax impact between options.
@@ -376,6 +431,7 @@ def create_sensitivity_heatmap(
     summary: ComparisonSummary,
     return_rates: Optional[list[float]] = None,
     inflation_rates: Optional[list[float]] = None,
+    grid: Optional[SensitivityGrid] = None,
 ) -> go.Figure:
     """
     Create a heatmap showing crossover age for different parameter combinations.
@@ -384,6 +440,7 @@ def create_sensitivity_heatmap(
         summary: ComparisonSummary with base inputs
         return_rates: List of return rates to test
         inflation_rates: List of inflation rates to test
+        grid: Precomputed SensitivityGrid (evaluated from the rates if None)
 
     Returns:
         Plotly Figure object
@@ -394,22 +451,13 @@ def create_sensitivity_heatmap(
     if inflation_rates is None:
         inflation_rates = [0.01, 0.02, 0.025, 0.03, 0.04]
 
-    # Generate sensitivity data
-    sensitivity_data = generate_sensitivity_analysis(
-        summary.inputs, return_rates, inflation_rates
-    )
-
-    # Build matrix
-    matrix = []
-    for ret in return_rates:
-        row = []
-        for inf in inflation_rates:
-            # Find matching point
-            for point in sensitivity_data:
-                if point.return_rate == ret and point.inflation_rate == inf:
-                    row.append(point.crossover_age if point.crossover_age else 60)
-                    break
-        matrix.append(row)
+    # Evaluate the whole grid at once and build the crossover matrix
+    if grid is None:
+        grid = evaluate_sensitivity_grid(summary.inputs, return_rates, inflation_rates)
+    return_rates = list(grid.return_rates)
+    inflation_rates = list(grid.inflation_rates)
+    crossover_ages = np.nan_to_num(grid.crossover_age_matrix(), nan=60)
+    matrix = crossover_ages.astype(int).tolist()
 
     # Create heatmap
     fig = go.Figure(
@@ -469,21 +517,9 @@ def create_advantage_heatmap(
     if inflation_rates is None:
         inflation_rates = [0.01, 0.02, 0.025, 0.03, 0.04]
 
-    # Generate sensitivity data
-    sensitivity_data = generate_sensitivity_analysis(
-        summary.inputs, return_rates, inflation_rates
-    )
-
     # Build matrix of advantages at age 30
-    matrix = []
-    for ret in return_rates:
-        row = []
-        for inf in inflation_rates:
-            for point in sensitivity_data:
-                if point.return_rate == ret and point.inflation_rate == inf:
-                    row.append(point.provident_advantage_at_30)
-                    break
-        matrix.append(row)
+    grid = evaluate_sensitivity_grid(summary.inputs, return_rates, inflation_rates)
+    matrix = grid.advantage_at(30).tolist()
 
     # Create heatmap
     fig = go.Figure(
@@ -624,8 +660,12 @@ def create_monthly_withdrawal_breakdown_chart(
     provident_principal_monthly = withdrawal_result.provident_gross_monthly * provident_principal_ratio
     provident_gains_monthly = withdrawal_result.provident_gross_monthly - provident_principal_monthly
     
-    personal_principal_monthly = withdrawal_result.personal_gross_monthly * personal_principal_ratio
-    personal_gains_monthly = withdrawal_result.personal_gross_monthly - personal_principal_monthly
+    if withdrawal_result.personal_drawdown is not None:
+        # Average gain actually realized by each withdrawal over the drawdown
+        personal_gains_monthly = float(withdrawal_result.personal_drawdown.mean_realized_gain_monthly)
+    else:
+        personal_gains_monthly = withdrawal_result.personal_gross_monthly * (1 - personal_principal_ratio)
+    personal_principal_monthly = withdrawal_result.personal_gross_monthly - personal_gains_monthly
     personal_gains_after_tax = personal_gains_monthly - withdrawal_result.personal_tax_per_month
     
     fig = go.Figure()
@@ -677,6 +717,77 @@ def create_monthly_withdrawal_breakdown_chart(
     return fig
 
 
+def create_drawdown_chart(
+    withdrawal_result: MonthlyWithdrawalResult,
+    retirement_age: int,
+) -> go.Figure:
+    """
+    Create a chart of both balances and the personal-account tax through retirement.
+
+    Args:
+        withdrawal_result: MonthlyWithdrawalResult from calculate_monthly_withdrawal_comparison
+        retirement_age: Age at the first withdrawal
+
+    Returns:
+        Plotly Figure object
+    """
+    provident = withdrawal_result.provident_drawdown
+    personal = withdrawal_result.personal_drawdown
+    if provident is None or personal is None:
+        raise ValueError("Withdrawal result has no drawdown trajectories")
+
+    ages = retirement_age + provident.months / 12
+
+    fig = go.Figure()
+
+    fig.add_trace(
+        go.Scatter(
+            x=ages,
+            y=provident.balance,
+            mode="lines",
+            name="Provident Fund Balance",
+            line=dict(color=PROVIDENT_COLOR, width=3),
+            hovertemplate="Age %{x:.1f}<br>Provident Balance: ₪%{y:,.0f}<extra></extra>",
+        )
+    )
+
+    fig.add_trace(
+        go.Scatter(
+            x=ages,
+            y=personal.balance,
+            mode="lines",
+            name="Personal Account Balance",
+            line=dict(color=PERSONAL_COLOR, width=3),
+            hovertemplate="Age %{x:.1f}<br>Personal Balance: ₪%{y:,.0f}<extra></extra>",
+        )
+    )
+
+    fig.add_trace(
+        go.Scatter(
+            x=ages[1:],
+            y=personal.tax,
+            mode="lines",
+            name="Personal Tax per Month",
+            line=dict(color=TAX_COLOR, width=2, dash="dot"),
+            yaxis="y2",
+            hovertemplate="Age %{x:.1f}<br>Tax: ₪%{y:,.0f}/month<extra></extra>",
+        )
+    )
+
+    fig.update_layout(
+        title=f"Drawdown During Retirement ({personal.cost_basis_method.upper()} cost basis)",
+        xaxis_title="Age",
+        yaxis=dict(title="Balance (₪)", tickformat=","),
+        yaxis2=dict(title="Tax per Month (₪)", tickformat=",", overlaying="y", side="right"),
+        template="plotly_white",
+        height=400,
+        hovermode="x unified",
+        legend=dict(yanchor="top", y=0.99, xanchor="right", x=0.99),
+    )
+
+    return fig
+
+
 def create_withdrawal_mode_comparison(
     summary_lump: ComparisonSummary,
     summary_annuity: ComparisonSummary,
@@ -691,10 +802,10 @@ def create_withdrawal_mode_comparison(
     Returns:
         Plotly Figure object
     """
-    ages = [r.starting_age for r in summary_annuity.age_results]
+    ages = summary_annuity.age_results.column("starting_age").tolist()
     
-    annuity_diffs = [r.difference for r in summary_annuity.age_results]
-    lump_diffs = [r.difference for r in summary_lump.age_results]
+    annuity_diffs = summary_annuity.age_results.difference.tolist()
+    lump_diffs = summary_lump.age_results.difference.tolist()
 
     fig = go.Figure()
 
@@ -0,0 +1,132 @@
+"""Lightweight per-stage timing for app reruns.
+
+A Profiler records wall time and call counts for named stages (calculator
+calls, DataFrame building, chart construction). When disabled, stages are
+no-ops, so instrumentation can stay in place permanently. Recorded spans
+can be summarized, exported as JSON, or exported in the Chrome trace event
+format (open in chrome://tracing or https://ui.perfetto.dev).
+
+Enable it with the PROVIDENT_PROFILE=1 environment variable or the sidebar
+toggle in the app.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator
+
+
+PROFILE_ENV_VAR = "PROVIDENT_PROFILE"
+
+
+def profiling_enabled_from_env() -> bool:
+    """Whether profiling is switched on through the environment."""
+    return os.environ.get(PROFILE_ENV_VAR, "").lower() in ("1", "true", "yes", "on")
+
+
+@dataclass
+class Span:
+    """One timed execution of a stage."""
+
+    name: str  # Stage name, e.g. "run_multi_mode_comparison"
+    category: str  # Stage group, e.g. "calculator", "dataframe", "chart"
+    start_ns: int  # perf_counter_ns at entry
+    duration_ns: int  # Wall time spent in the stage
+    thread_id: int  # Thread that ran the stage
+
+
+class Profiler:
+    """Collects timed spans for named stages."""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.spans: list[Span] = []
+        self._origin_ns = time.perf_counter_ns()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str, category: str = "app") -> Iterator[None]:
+        """Time the enclosed block as one call of a stage."""
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            span = Span(
+                name=name,
+                category=category,
+                start_ns=start,
+                duration_ns=time.perf_counter_ns() - start,
+                thread_id=threading.get_ident(),
+            )
+            with self._lock:
+                self.spans.append(span)
+
+    def summary(self) -> list[dict]:
+        """Per-stage call counts and wall times, slowest stage first."""
+        stages: dict[tuple[str, str], list[int]] = {}
+        for span in self.spans:
+            stages.setdefault((span.category, span.name), []).append(span.duration_ns)
+
+        rows = [
+            {
+                "Stage": name,
+                "Category": category,
+                "Calls": len(durations),
+                "Total (ms)": sum(durations) / 1e6,
+                "Mean (ms)": sum(durations) / len(durations) / 1e6,
+                "Max (ms)": max(durations) / 1e6,
+            }
+            for (category, name), durations in stages.items()
+        ]
+        return sorted(rows, key=lambda row: row["Total (ms)"], reverse=True)
+
+    @property
+    def total_ms(self) -> float:
+        """Wall time from profiler creation to the end of the last span."""
+        if not self.spans:
+            return 0.0
+        end = max(span.start_ns + span.duration_ns for span in self.spans)
+        return (end - self._origin_ns) / 1e6
+
+    def to_json(self) -> str:
+        """Export the summary and raw spans as JSON."""
+        return json.dumps(
+            {
+                "total_ms": self.total_ms,
+                "stages": self.summary(),
+                "spans": [
+                    {
+                        "name": span.name,
+                        "category": span.category,
+                        "start_ms": (span.start_ns - self._origin_ns) / 1e6,
+                        "duration_ms": span.duration_ns / 1e6,
+                    }
+                    for span in self.spans
+                ],
+            },
+            indent=2,
+        )
+
+    def to_chrome_trace(self) -> str:
+        """Export spans in the Chrome trace event format."""
+        pid = os.getpid()
+        events = [
+            {
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",  # Complete event
+                "ts": (span.start_ns - self._origin_ns) / 1e3,  # Microseconds
+                "dur": span.duration_ns / 1e3,
+                "pid": pid,
+                "tid": span.thread_id,
+            }
+            for span in self.spans
+        ]
+        return json.dumps({"traceEvents": events, "displayTimeUnit": "ms"})
@@ -0,0 +1,241 @@
+"""Precomputed growth-factor tables over the slider domain.
+
+The sidebar moves in discrete steps: expected returns in 0.5% steps, fees
+in 0.05% steps, inflation in 0.5% steps and whole years. This module
+tabulates the annuity growth factor ((1 + r)^n - 1) / r for every
+(expected return, fee, years) point of that domain, and the inflation-basis
+factor for every (inflation, years) point. It stores them as .npy files and
+memory-maps them on load (a few milliseconds, no parsing), so a
+long-running API process answers on-grid requests with one gather.
+
+Off-grid values inside the domain are interpolated linearly along each
+axis. Values outside the domain fall back to the closed form. Results are
+exact on grid points.
+
+Usage:
+    tables = get_tables()
+    fv = tables.future_value(83_641, expected_return=0.07, mgmt_fee=0.006, years=30)
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+
+from .calculator import annuity_factor
+
+
+TABLE_VERSION = 1
+TABLE_DIR_ENV_VAR = "PROVIDENT_TABLE_DIR"
+DEFAULT_TABLE_DIR = Path.home() / ".cache" / "provident_tables"
+
+# Axis -> (start, step, count), matching the sidebar slider ranges
+RETURN_AXIS = (0.030, 0.005, 25)  # 3.0% .. 15.0%
+FEE_AXIS = (0.0, 0.0005, 22)  # 0.00% .. 1.05%
+INFLATION_AXIS = (0.0, 0.005, 11)  # 0.0% .. 5.0%
+YEARS_AXIS = (0, 1, 53)  # 0 .. 52 years (ages 18-70)
+
+_GROWTH_FILE = "growth_factors.npy"
+_INFLATION_FILE = "inflation_factors.npy"
+_META_FILE = "tables.json"
+
+_SNAP_TOLERANCE = 1e-9  # Grid positions this close to an integer snap to it
+
+
+def _axis_values(axis: tuple) -> np.ndarray:
+    start, step, count = axis
+    return start + step * np.arange(count)
+
+
+def _metadata() -> dict:
+    return {
+        "version": TABLE_VERSION,
+        "return_axis": RETURN_AXIS,
+        "fee_axis": FEE_AXIS,
+        "inflation_axis": INFLATION_AXIS,
+        "years_axis": YEARS_AXIS,
+    }
+
+
+def _table_dir(directory: Optional[Union[str, Path]]) -> Path:
+    if directory is not None:
+        return Path(directory)
+    return Path(os.environ.get(TABLE_DIR_ENV_VAR, DEFAULT_TABLE_DIR))
+
+
+def build_tables(directory: Optional[Union[str, Path]] = None) -> Path:
+    """
+    Compute the tables and write them to a directory.
+
+    Files are written under temporary names and renamed into place, so
+    concurrent readers never see a partial table.
+
+    Args:
+        directory: Target directory (PROVIDENT_TABLE_DIR or ~/.cache if None)
+
+    Returns:
+        The directory the tables were written to
+    """
+    directory = _table_dir(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    returns = _axis_values(RETURN_AXIS)[:, None, None]
+    fees = _axis_values(FEE_AXIS)[None, :, None]
+    years = _axis_values(YEARS_AXIS)
+    net_returns = (1 + returns) * (1 - fees) - 1
+
+    arrays = {
+        _GROWTH_FILE: annuity_factor(net_returns, years[None, None, :]),
+        _INFLATION_FILE: annuity_factor(_axis_values(INFLATION_AXIS)[:, None], years[None, :]),
+    }
+    for name, array in arrays.items():
+        tmp = directory / f".{name}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as handle:
+            np.save(handle, np.ascontiguousarray(array, dtype=np.float64))
+        os.replace(tmp, directory / name)
+
+    tmp = directory / f".{_META_FILE}.{os.getpid()}.tmp"
+    tmp.write_text(json.dumps(_metadata()))
+    os.replace(tmp, directory / _META_FILE)
+    return directory
+
+
+def _locate(values, axis: tuple) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Lower grid index, interpolation weight and in-domain mask on a uniform axis."""
+    start, step, count = axis
+    position = (np.asarray(values, dtype=float) - start) / step
+    nearest = np.rint(position)
+    position = np.where(np.abs(position - nearest) < _SNAP_TOLERANCE, nearest, position)
+
+    inside = (position >= 0) & (position <= count - 1)
+    lower = np.clip(np.floor(position), 0, count - 2).astype(np.intp)
+    weight = np.clip(position - lower, 0.0, 1.0)
+    return lower, weight, inside
+
+
+class GrowthFactorTables:
+    """Memory-mapped growth and inflation-basis factor tables."""
+
+    def __init__(self, growth_factors: np.ndarray, inflation_factors: np.ndarray):
+        self.growth_factors = growth_factors  # Shape (returns, fees, years)
+        self.inflation_factors = inflation_factors  # Shape (inflation rates, years)
+
+    def annuity_factor(self, expected_return, mgmt_fee, years) -> np.ndarray:
+        """
+        Future value factor for a unit annual contribution.
+
+        Args:
+            expected_return: Gross expected return(s) before fees
+            mgmt_fee: Annual management fee(s)
+            years: Year count(s), may be fractional
+
+        Returns:
+            Array of factors with the broadcast shape of the arguments
+        """
+        expected_return, mgmt_fee, years = np.broadcast_arrays(
+            np.asarray(expected_return, dtype=float),
+            np.asarray(mgmt_fee, dtype=float),
+            np.asarray(years, dtype=float),
+        )
+        r0, rw, r_in = _locate(expected_return, RETURN_AXIS)
+        f0, fw, f_in = _locate(mgmt_fee, FEE_AXIS)
+        y0, yw, y_in = _locate(np.maximum(years, 0.0), YEARS_AXIS)
+
+        # Trilinear interpolation over the 8 surrounding grid points
+        table = self.growth_factors
+        result = np.zeros(expected_return.shape)
+        for dr, wr in ((0, 1 - rw), (1, rw)):
+            for df, wf in ((0, 1 - fw), (1, fw)):
+                for dy, wy in ((0, 1 - yw), (1, yw)):
+                    result += wr * wf * wy * table[r0 + dr, f0 + df, y0 + dy]
+
+        outside = ~(r_in & f_in & y_in)
+        if outside.any():
+            net_return = (1 + expected_return[outside]) * (1 - mgmt_fee[outside]) - 1
+            result[outside] = annuity_factor(net_return, years[outside])
+        return result
+
+    def inflation_factor(self, inflation_rate, years) -> np.ndarray:
+        """
+        Inflation-basis factor for a unit annual contribution.
+
+        Args:
+            inflation_rate: Annual inflation rate(s)
+            years: Year count(s), may be fractional
+
+        Returns:
+            Array of factors with the broadcast shape of the arguments
+        """
+        inflation_rate, years = np.broadcast_arrays(
+            np.asarray(inflation_rate, dtype=float),
+            np.asarray(years, dtype=float),
+        )
+        i0, iw, i_in = _locate(inflation_rate, INFLATION_AXIS)
+        y0, yw, y_in = _locate(np.maximum(years, 0.0), YEARS_AXIS)
+
+        table = self.inflation_factors
+        result = (
+            (1 - iw) * (1 - yw) * table[i0, y0]
+            + (1 - iw) * yw * table[i0, y0 + 1]
+            + iw * (1 - yw) * table[i0 + 1, y0]
+            + iw * yw * table[i0 + 1, y0 + 1]
+        )
+
+        outside = ~(i_in & y_in)
+        if outside.any():
+            result[outside] = annuity_factor(inflation_rate[outside], years[outside])
+        return result
+
+    def future_value(self, annual_contribution, expected_return, mgmt_fee, years) -> np.ndarray:
+        """Table counterpart of ``calculate_future_value`` at the fee-adjusted return."""
+        return annual_contribution * self.annuity_factor(expected_return, mgmt_fee, years)
+
+    def inflation_adjusted_contributions(self, annual_contribution, inflation_rate, years) -> np.ndarray:
+        """Table counterpart of ``calculate_inflation_adjusted_contributions``."""
+        return annual_contribution * self.inflation_factor(inflation_rate, years)
+
+
+def load_tables(
+    directory: Optional[Union[str, Path]] = None,
+    build_if_missing: bool = True,
+) -> GrowthFactorTables:
+    """
+    Memory-map the tables, building them first if absent or outdated.
+
+    Args:
+        directory: Table directory (PROVIDENT_TABLE_DIR or ~/.cache if None)
+        build_if_missing: Build the tables when missing or stale instead of failing
+
+    Returns:
+        GrowthFactorTables backed by read-only memory maps
+    """
+    directory = _table_dir(directory)
+    meta_path = directory / _META_FILE
+
+    try:
+        current = json.loads(meta_path.read_text()) == json.loads(json.dumps(_metadata()))
+    except (OSError, ValueError):
+        current = False
+
+    if not current:
+        if not build_if_missing:
+            raise FileNotFoundError(f"No up-to-date growth-factor tables in {directory}")
+        build_tables(directory)
+
+    return GrowthFactorTables(
+        growth_factors=np.load(directory / _GROWTH_FILE, mmap_mode="r"),
+        inflation_factors=np.load(directory / _INFLATION_FILE, mmap_mode="r"),
+    )
+
+
+_tables: Optional[GrowthFactorTables] = None
+
+
+def get_tables() -> GrowthFactorTables:
+    """Process-wide tables, loaded on first use."""
+    global _tables
+    if _tables is None:
+        _tables = load_tables()
+    return _tables
@@ -0,0 +1,150 @@
+"""Withdrawal-phase models for the Provident Fund.
+
+Split withdrawal: part of the Provident balance is taken as a lump sum
+(real-gains tax on its pro-rata share of the gain) and the rest is
+converted to an annuity (tax-free from age 60, reduced by the insurer's
+annuity loading). Every (lump-sum fraction x starting age) combination is
+evaluated in one broadcast pass, and the best feasible fraction per age
+is picked under minimum lump-sum and minimum monthly-income constraints.
+
+Personal drawdowns: the personal account is run through the monthly
+decumulation engine for every (scenario x starting age) pair at once.
+"""
+
+from dataclasses import replace
+from typing import Optional
+
+import numpy as np
+
+from .models import ProvidentInputs, SplitWithdrawalResult, DecumulationResult
+from .calculator import calculate_comparison_arrays, is_annuity_exempt, split_provident_tax
+from .decumulation import (
+    DEFAULT_WITHDRAWAL_RETURN,
+    annual_deposit_lots,
+    monthly_payment,
+    simulate_decumulation,
+)
+
+
+DEFAULT_SPLIT_FRACTIONS = np.linspace(0.0, 1.0, 21)  # 0%, 5%, ..., 100% as lump sum
+TIE_TOLERANCE = 1e-9  # Relative gap below which split values count as equal
+
+
+def optimize_withdrawal_split(
+    inputs: ProvidentInputs,
+    fractions: Optional[np.ndarray] = None,
+    annuity_loading: float = 0.0,
+    min_lump_sum: float = 0.0,
+    min_monthly_income: float = 0.0,
+    withdrawal_return: float = DEFAULT_WITHDRAWAL_RETURN,
+    min_age: int = 18,
+    max_age: int = 59,
+) -> SplitWithdrawalResult:
+    """
+    Find the best lump-sum / annuity split of the Provident balance per starting age.
+
+    The value of a split is the lump sum after tax plus the annuitized
+    balance (after loading and any tax). Among splits that meet both
+    minimums, the highest value wins; ties go to the smaller lump sum.
+
+    Args:
+        inputs: All input parameters (withdrawal_mode is ignored)
+        fractions: Lump-sum shares to evaluate, in [0, 1] (0% to 100% in 5% steps if None)
+        annuity_loading: Share of the annuitized balance lost to annuity pricing
+        min_lump_sum: Minimum lump sum after tax
+        min_monthly_income: Minimum annuity income per month
+        withdrawal_return: Annual return assumed in the annuity payout
+        min_age: Minimum starting age to analyze
+        max_age: Maximum starting age to analyze
+
+    Returns:
+        SplitWithdrawalResult with per-split outcomes and the best split per age
+    """
+    fractions = DEFAULT_SPLIT_FRACTIONS if fractions is None else np.asarray(fractions, dtype=float)
+    if ((fractions < 0) | (fractions > 1)).any():
+        raise ValueError("Fractions must be between 0 and 1")
+    if not 0 <= annuity_loading < 1:
+        raise ValueError("annuity_loading must be in [0, 1)")
+
+    # One accumulation pass; lump-sum tax is the full real-gains tax
+    arrays = calculate_comparison_arrays(replace(inputs, withdrawal_mode="lump_sum"), min_age, max_age)
+    gross = arrays["provident_gross"][None, :]
+
+    # Axes: (fraction, starting age); same tax rule as calculate_split_provident_tax
+    share = fractions[:, None]
+    lump_sum_tax, annuity_tax = split_provident_tax(
+        arrays["provident_tax"][None, :],
+        share,
+        annuity_exempt=is_annuity_exempt("annuity", inputs.retirement_age),
+    )
+    lump_sum_net = share * gross - lump_sum_tax
+    annuity_value = ((1 - share) * gross - annuity_tax) * (1 - annuity_loading)
+
+    withdrawal_years = max(inputs.life_expectancy - inputs.retirement_age, 1)
+    monthly_income = monthly_payment(annuity_value, withdrawal_years, withdrawal_return)
+    total_value = lump_sum_net + annuity_value
+
+    feasible = (lump_sum_net >= min_lump_sum) & (monthly_income >= min_monthly_income)
+    ranked = np.where(feasible, total_value, -np.inf)
+    # First (smallest) fraction within rounding of the best value
+    top = ranked.max(axis=0)
+    best = (ranked >= top - TIE_TOLERANCE * np.abs(top)).argmax(axis=0)
+    any_feasible = feasible.any(axis=0)
+    columns = np.arange(ranked.shape[1])
+
+    return SplitWithdrawalResult(
+        fractions=fractions,
+        starting_ages=arrays["starting_age"],
+        lump_sum_net=lump_sum_net,
+        monthly_income=monthly_income,
+        total_value=total_value,
+        feasible=feasible,
+        best_fraction=np.where(any_feasible, fractions[best], np.nan),
+        best_value=np.where(any_feasible, total_value[best, columns], np.nan),
+    )
+
+
+def simulate_personal_drawdowns(
+    inputs: ProvidentInputs,
+    withdrawal_returns=DEFAULT_WITHDRAWAL_RETURN,
+    cost_basis_method: str = "fifo",
+    min_age: int = 18,
+    max_age: int = 59,
+) -> DecumulationResult:
+    """
+    Month-by-month personal-account drawdowns across scenarios and starting ages.
+
+    Each starting age retires with the lots of its annual deposits and
+    draws them down over the years to life expectancy, paying tax on the
+    gain realized by each withdrawal.
+
+    Args:
+        inputs: All input parameters
+        withdrawal_returns: Annual return during withdrawal, scalar or one per scenario
+        cost_basis_method: "fifo" or "average"
+        min_age: Minimum starting age to analyze
+        max_age: Maximum starting age to analyze
+
+    Returns:
+        DecumulationResult with batch shape (scenarios, ages), or (ages,)
+        for a scalar withdrawal return
+    """
+    withdrawal_returns = np.asarray(withdrawal_returns, dtype=float)
+    starting_ages = np.arange(min_age, max_age + 1)
+    lot_values, lot_costs = annual_deposit_lots(
+        inputs.annual_contribution,
+        inputs.get_personal_net_return(),
+        np.maximum(inputs.retirement_age - starting_ages, 0),
+    )
+
+    # Axes: (scenario, starting age, lot)
+    scenario_shape = withdrawal_returns.shape
+    lot_values = np.broadcast_to(lot_values, scenario_shape + lot_values.shape)
+    return simulate_decumulation(
+        lot_values,
+        lot_costs,
+        withdrawal_years=max(inputs.life_expectancy - inputs.retirement_age, 1),
+        annual_return=withdrawal_returns[..., None],
+        tax_rate=inputs.capital_gains_tax,
+        cost_basis_method=cost_basis_method,
+    )
@@ -0,0 +1,51 @@
+"""Tests for batch scoring (run with: python -m unittest discover tests)."""
+
+import unittest
+from dataclasses import asdict
+
+import pandas as pd
+
+from src.calculator import calculate_comparison_for_starting_age
+from src.cli import RESULT_DTYPES, score_frame
+from src.models import ProvidentInputs
+
+
+def make_inputs(current_age: int, retirement_age: int) -> ProvidentInputs:
+    return ProvidentInputs(
+        current_age=current_age,
+        retirement_age=retirement_age,
+        life_expectancy=90,
+        annual_contribution=12_000,
+        annual_cap=83_641,
+        provident_expected_return=0.07,
+        personal_expected_return=0.07,
+        inflation_rate=0.025,
+        provident_mgmt_fee=0.006,
+        personal_mgmt_fee=0.001,
+        capital_gains_tax=0.25,
+        withdrawal_mode="annuity",
+    )
+
+
+class ScoreFrameTest(unittest.TestCase):
+    def test_scores_ages_outside_starting_age_grid(self):
+        profiles = [make_inputs(62, 66), make_inputs(16, 67), make_inputs(35, 67)]
+        scored = score_frame(pd.DataFrame([asdict(inputs) for inputs in profiles]))
+
+        for (_, row), inputs in zip(scored.iterrows(), profiles):
+            expected = calculate_comparison_for_starting_age(inputs.current_age, inputs)
+            self.assertAlmostEqual(row["provident_net"], expected.provident_net, places=6)
+            self.assertAlmostEqual(row["personal_net"], expected.personal_net, places=6)
+            self.assertAlmostEqual(row["difference"], expected.difference, places=6)
+        self.assertFalse(scored[["provident_net", "personal_net", "difference"]].isna().any().any())
+
+    def test_empty_chunk_keeps_result_dtypes(self):
+        empty = pd.DataFrame([asdict(make_inputs(35, 67))]).iloc[:0]
+        scored = score_frame(empty)
+
+        for name, dtype in RESULT_DTYPES.items():
+            self.assertEqual(str(scored[name].dtype), dtype)
+
+
+if __name__ == "__main__":
+    unittest.main()